@@ -2,11 +2,125 @@
 Base DDC/CI functionality for monitor control
 """
 
+import fcntl
+import functools
+import os
+import random
 import re
+import shutil
 import subprocess
 import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Patterns for parsing ddcutil output
+_DISPLAY_RE = re.compile(r"Display (\d+)")
+_BUS_RE = re.compile(r"Display (\d+)\s+I2C bus:\s+/dev/i2c-(\d+)")
+_VCP_RE = re.compile(r"current value =\s*(?P<cur>\d+).*?max value =\s*(?P<mx>\d+)", re.DOTALL)
+
+
+@functools.lru_cache(maxsize=1)
+def check_ddcutil() -> bool:
+    """
+    Check if ddcutil is available on the system
+
+    The result is cached, so the PATH is only scanned once per process.
+    """
+    return shutil.which("ddcutil") is not None
+
+
+class DirectDDC:
+    """
+    Direct DDC/CI writes through /dev/i2c-N, bypassing the ddcutil CLI.
+    Only Set VCP Feature is implemented; anything else goes through ddcutil.
+    """
+
+    I2C_SLAVE = 0x0703  # ioctl to select the I2C slave address
+    DDC_CI_ADDR = 0x37  # Monitor's DDC/CI slave address
+    HOST_ADDR = 0x51  # Source address for host to display messages
+    SET_VCP = 0x03  # Set VCP Feature opcode
+    SET_VCP_INTERVAL = 0.05  # DDC/CI minimum wait after a Set VCP Feature, in seconds
+
+    def __init__(self, buses: Dict[int, int]) -> None:
+        """
+        Open the I2C device for each display
+
+        Args:
+            buses: Mapping of display number to I2C bus number
+        """
+        self._fds: Dict[int, int] = {}
+
+        for display, bus in buses.items():
+            try:
+                fd = os.open(f"/dev/i2c-{bus}", os.O_RDWR)
+            except OSError:
+                continue
+            try:
+                fcntl.ioctl(fd, self.I2C_SLAVE, self.DDC_CI_ADDR)
+            except OSError:
+                os.close(fd)
+                continue
+            self._fds[display] = fd
+
+    def has_display(self, display: int) -> bool:
+        """Check if a display can be written to directly"""
+        return display in self._fds
+
+    def build_set_vcp_packet(self, vcp_code: int, value: int) -> bytes:
+        """
+        Build a DDC/CI Set VCP Feature message
+
+        Args:
+            vcp_code: VCP code as an integer
+            value: 16-bit value to set
+
+        Returns:
+            Packet bytes, including the trailing checksum
+        """
+        payload = [self.HOST_ADDR, 0x84, self.SET_VCP, vcp_code, value >> 8, value & 0xFF]
+
+        # Checksum is the XOR of the destination write address and every byte
+        checksum = self.DDC_CI_ADDR << 1
+        for byte in payload:
+            checksum ^= byte
+
+        return bytes(payload + [checksum])
+
+    def set_vcp_values(self, display: int, values: List[Tuple[str, int]]) -> bool:
+        """
+        Write VCP values to a display
+
+        Consecutive packets are spaced by SET_VCP_INTERVAL. Callers keep the
+        same gap between calls; AsyncDDCWorker holds updates back for it.
+
+        Args:
+            display: Display number
+            values: List of (vcp_code, value) pairs, vcp_code as a hex string
+
+        Returns:
+            True if every value was written, False otherwise
+        """
+        fd = self._fds.get(display)
+        if fd is None:
+            return False
+
+        try:
+            for i, (vcp_code, value) in enumerate(values):
+                if i:
+                    time.sleep(self.SET_VCP_INTERVAL)
+                os.write(fd, self.build_set_vcp_packet(int(vcp_code, 16), value))
+            return True
+        except OSError:
+            return False
+
+    def close(self) -> None:
+        """Close all open I2C devices"""
+        for fd in self._fds.values():
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fds.clear()
 
 
 class DDCInterface:
@@ -17,17 +131,16 @@ class DDCInterface:
 
     def __init__(self) -> None:
         self.displays: List[int] = []
-        self._lock = threading.Lock()
-        self._last_command_time = 0.0
-        self._command_interval = 1.0  # inimum time between DDC commands
+        self._lock = threading.Lock()  # Guards _display_locks
+        self._display_locks: Dict[int, threading.Lock] = {}
+        self._last_command_time: Dict[int, float] = {}
+        self._command_interval = 1.0  # Minimum time between DDC commands per display
+        self.buses: Dict[int, int] = {}  # Display number to I2C bus number
+        self._direct: Optional[DirectDDC] = None
 
     def check_ddcutil(self) -> bool:
         """Check if ddcutil is available on the system"""
-        try:
-            subprocess.run(["which", "ddcutil"], capture_output=True, check=True, timeout=2)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
+        return check_ddcutil()
 
     def detect_displays(self) -> List[int]:
         """
@@ -41,8 +154,15 @@ class DDCInterface:
                 ["ddcutil", "detect"], capture_output=True, text=True, timeout=5
             )
 
-            displays = re.findall(r"Display (\d+)", result.stdout)
+            displays = _DISPLAY_RE.findall(result.stdout)
             self.displays = [int(d) for d in displays]
+            self.buses = {int(d): int(b) for d, b in _BUS_RE.findall(result.stdout)}
+
+            # Open the direct I2C fast path for the detected displays
+            if self._direct is not None:
+                self._direct.close()
+            self._direct = DirectDDC(self.buses)
+
             return self.displays
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
@@ -60,21 +180,19 @@ class DDCInterface:
             Tuple of (current_value, max_value) or (None, None) on error
         """
         try:
-            with self._lock:
-                self._wait_for_command_interval()
+            with self._display_lock(display):
+                self._wait_for_command_interval(display)
 
                 result = subprocess.run(
-                    ["ddcutil", "getvcp", vcp_code, "-d", str(display)],
+                    ["ddcutil", "getvcp", vcp_code, *self._display_args(display)],
                     capture_output=True,
                     text=True,
                     timeout=2,
                 )
 
-                current_match = re.search(r"current value =\s*(\d+)", result.stdout)
-                max_match = re.search(r"max value =\s*(\d+)", result.stdout)
-
-                if current_match and max_match:
-                    return int(current_match.group(1)), int(max_match.group(1))
+                match = _VCP_RE.search(result.stdout)
+                if match:
+                    return int(match["cur"]), int(match["mx"])
 
         except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError):
             pass
@@ -94,12 +212,20 @@ class DDCInterface:
             True if successful, False otherwise
         """
         try:
-            with self._lock:
-                self._wait_for_command_interval()
+            with self._display_lock(display):
+                self._wait_for_command_interval(display)
 
                 subprocess.run(
-                    ["ddcutil", "setvcp", vcp_code, str(value), "-d", str(display)],
-                    capture_output=True,
+                    [
+                        "ddcutil",
+                        "setvcp",
+                        vcp_code,
+                        str(value),
+                        "--noverify",
+                        *self._display_args(display),
+                    ],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
                     timeout=3,
                     check=True,
                 )
@@ -120,37 +246,118 @@ class DDCInterface:
         Returns:
             Popen process object
         """
+        return self.set_vcp_values_async(display, [(vcp_code, value)])
+
+    def set_vcp_values_async(self, display: int, values: List[Tuple[str, int]]) -> subprocess.Popen:
+        """
+        Set several VCP values on one display with a single ddcutil invocation
+
+        ddcutil has no persistent session mode, but setvcp accepts multiple
+        feature/value pairs, so every pending update for a display costs at
+        most one process spawn.
+
+        Args:
+            display: Display number
+            values: List of (vcp_code, value) pairs to set
+
+        Returns:
+            Popen process object
+        """
+        args = []
+        for vcp_code, value in values:
+            args += [vcp_code, str(value)]
+
         return subprocess.Popen(
-            ["ddcutil", "setvcp", vcp_code, str(value), "-d", str(display)],
+            ["ddcutil", "setvcp", *args, "--noverify", *self._display_args(display)],
             stdout=subprocess.DEVNULL,
             stderr=subprocess.DEVNULL,
         )
 
-    def _wait_for_command_interval(self) -> None:
-        """Ensure minimum time between DDC commands to prevent flooding"""
+    def set_vcp_values_direct(self, display: int, values: List[Tuple[str, int]]) -> bool:
+        """
+        Set VCP values by writing DDC/CI packets straight to the display's
+        I2C device, skipping the ddcutil process spawn
+
+        Args:
+            display: Display number
+            values: List of (vcp_code, value) pairs to set
+
+        Returns:
+            True if the values were written, False if the caller should fall
+            back to ddcutil
+        """
+        if self._direct is None or not self._direct.has_display(display):
+            return False
+        return self._direct.set_vcp_values(display, values)
+
+    def close(self) -> None:
+        """Release the I2C devices opened for the direct write path"""
+        if self._direct is not None:
+            self._direct.close()
+            self._direct = None
+
+    def _display_args(self, display: int) -> List[str]:
+        """
+        Get the ddcutil arguments that select a display
+
+        Displays whose I2C bus is known are addressed with --bus, which lets
+        ddcutil skip detecting every display again on each call.
+        """
+        bus = self.buses.get(display)
+        if bus is None:
+            return ["-d", str(display)]
+        return ["--bus", str(bus)]
+
+    def _display_lock(self, display: int) -> threading.Lock:
+        """
+        Get the lock serializing commands to one display
+
+        Each display sits on its own I2C bus, so commands to different
+        displays can run concurrently.
+        """
+        with self._lock:
+            return self._display_locks.setdefault(display, threading.Lock())
+
+    def _wait_for_command_interval(self, display: int) -> None:
+        """Ensure minimum time between DDC commands to a display to prevent flooding"""
         current_time = time.time()
-        time_since_last = current_time - self._last_command_time
+        time_since_last = current_time - self._last_command_time.get(display, 0.0)
 
         if time_since_last < self._command_interval:
             time.sleep(self._command_interval - time_since_last)
 
-        self._last_command_time = time.time()
+        self._last_command_time[display] = time.time()
 
 
 class AsyncDDCWorker:
     """
-    Background worker for sending DDC commands asynchronously with debouncing
+    Background worker for sending DDC commands asynchronously.
+
+    Updates are sent as soon as they are queued. While a display still has a
+    ddcutil command running, or was written directly less than
+    DirectDDC.SET_VCP_INTERVAL ago, newer values for it are coalesced and the
+    latest one is sent once the display is free.
     """
 
-    def __init__(self, ddc_interface: DDCInterface, update_interval: float = 0.5):
+    def __init__(
+        self,
+        ddc_interface: DDCInterface,
+        poll_interval: float = 0.01,
+        on_change: Optional[Callable[[], None]] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
         self.ddc = ddc_interface
-        self.update_interval = update_interval
+        self.poll_interval = poll_interval  # How often in-flight ddcutil runs are checked
+        self.on_change = on_change  # Called from the worker thread when _last_sent changes
+        self._sleep = sleep  # Used for the spawn failure backoff
         self.running = False
         self._thread: Optional[threading.Thread] = None
-        self._lock = threading.Lock()
         self._pending_updates: Dict[Tuple[int, str], int] = {}
         self._last_sent: Dict[Tuple[int, str], int] = {}
-        self._last_update_time = 0.0
+        self._inflight: Dict[int, subprocess.Popen] = {}  # Running ddcutil per display
+        self._direct_writes: Dict[int, float] = {}  # Monotonic time of recent direct writes
+        self._wake = threading.Event()  # Set whenever there is work to do
+        self._failures = 0  # Consecutive failed ddcutil spawns, for backoff
 
     def start(self) -> None:
         """Start the background worker thread"""
@@ -160,11 +367,29 @@ class AsyncDDCWorker:
             self._thread.start()
 
     def stop(self, timeout: float = 0.5) -> None:
-        """Stop the background worker thread"""
+        """
+        Stop the background worker thread
+
+        In-flight ddcutil commands get until the timeout to finish. Any still
+        running after that are terminated, so none is left holding the I2C bus.
+        """
         self.running = False
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=timeout)
 
+        deadline = time.time() + timeout
+        for process in list(self._inflight.values()):
+            try:
+                process.wait(timeout=max(0.0, deadline - time.time()))
+            except subprocess.TimeoutExpired:
+                process.terminate()
+                try:
+                    process.wait(timeout=timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        self._inflight.clear()
+
     def queue_update(self, display: int, vcp_code: str, value: int) -> None:
         """
         Queue a VCP value update to be sent asynchronously
@@ -174,39 +399,142 @@ class AsyncDDCWorker:
             vcp_code: VCP code
             value: Value to set
         """
-        with self._lock:
-            self._pending_updates[(display, vcp_code)] = value
+        # A single dict store is atomic, so the UI thread never takes a lock
+        self._pending_updates[(display, vcp_code)] = value
+        self._wake.set()
+
+    def queue_update_batch(self, updates: Dict[Tuple[int, str], int]) -> None:
+        """
+        Queue several VCP value updates, waking the worker once for all of them
+
+        The worker picks the whole batch up together, so it still costs at most
+        one ddcutil invocation per display.
+
+        Args:
+            updates: Mapping of (display, vcp_code) to value
+        """
+        self._pending_updates.update(updates)
+        self._wake.set()
+
+    def has_pending(self) -> bool:
+        """Check if any update is still waiting to be sent"""
+        return bool(self._pending_updates)
+
+    def _notify_change(self) -> None:
+        """Tell the owner that _last_sent has changed"""
+        if self.on_change is not None:
+            self.on_change()
 
     def _worker_loop(self) -> None:
         """Main worker loop for processing queued updates"""
         while self.running:
-            time.sleep(0.05)  # Check every 50ms
-
-            current_time = time.time()
-            if current_time - self._last_update_time < self.update_interval:
-                continue
+            # Sleep until an update is queued or the worker is stopped, waking
+            # when a busy display can take its held-back update
+            self._wake.wait(timeout=self._wait_timeout())
+            if not self.running:
+                break
+
+            self._wake.clear()
+            self._process_pending()
+
+    def _process_pending(self) -> None:
+        """Run one pass of the worker loop: send every update whose display is free"""
+        self._reap_inflight()
+        self._reap_direct_writes()
+
+        # Take the pending batch without a lock: list() and pop() are each
+        # atomic, and a value queued after its key was popped simply stays
+        # in the dict for the next batch (queue_update has set _wake again)
+        pending = {}
+        for key in list(self._pending_updates):
+            # Displays still busy keep their latest value queued until done
+            if key[0] not in self._inflight and key[0] not in self._direct_writes:
+                pending[key] = self._pending_updates.pop(key)
+
+        # _last_sent is only written from this thread
+        updates_to_send = []
+        for key, value in pending.items():
+            if self._last_sent.get(key) != value:
+                updates_to_send.append((key, value))
+                self._last_sent[key] = value
+
+        if updates_to_send:
+            self._notify_change()
+
+            if self._send_updates(updates_to_send):
+                self._failures = 0
+            else:
+                # Jittered exponential backoff before retrying the spawn
+                delay = min(0.05 * 2**self._failures + random.random() * 0.01, 1.0)
+                self._failures += 1
+                self._sleep(delay)
+
+    def _wait_timeout(self) -> Optional[float]:
+        """
+        Get how long the worker loop may sleep before it has work to do
 
-            updates_to_send = []
+        Returns:
+            The poll interval while ddcutil runs, the time left until a held
+            direct write is due, or None to sleep until woken
+        """
+        if self._inflight:
+            return self.poll_interval
+        if self._direct_writes and self._pending_updates:
+            due = min(self._direct_writes.values()) + DirectDDC.SET_VCP_INTERVAL
+            return max(0.0, due - time.monotonic())
+        return None
+
+    def _reap_direct_writes(self) -> None:
+        """Forget direct writes whose DDC/CI wait has passed"""
+        now = time.monotonic()
+        for display, written in list(self._direct_writes.items()):
+            if now - written >= DirectDDC.SET_VCP_INTERVAL:
+                del self._direct_writes[display]
+
+    def _reap_inflight(self) -> None:
+        """Forget ddcutil commands that have finished"""
+        for display, process in list(self._inflight.items()):
+            if process.poll() is not None:
+                del self._inflight[display]
+
+    def _send_updates(self, updates: List[Tuple[Tuple[int, str], int]]) -> bool:
+        """
+        Send a batch of updates, writing directly to the I2C device where
+        possible and otherwise with one ddcutil invocation per display
 
-            with self._lock:
-                for key, value in self._pending_updates.items():
-                    if self._last_sent.get(key) != value:
-                        updates_to_send.append((key, value))
-                        self._last_sent[key] = value
+        Spawned ddcutil processes are tracked as in flight rather than waited
+        on. Updates whose process could not be spawned are put back in the
+        queue so the worker retries them.
 
-                self._pending_updates.clear()
+        Args:
+            updates: List of ((display, vcp_code), value) pairs
 
-            if updates_to_send:
-                self._last_update_time = current_time
-                processes = []
+        Returns:
+            True if every process was spawned, False otherwise
+        """
+        failed = []
 
-                for (display, vcp_code), value in updates_to_send:
-                    p = self.ddc.set_vcp_value_async(display, vcp_code, value)
-                    processes.append(p)
+        # Group by display so each display gets one ddcutil invocation
+        by_display: Dict[int, List[Tuple[str, int]]] = {}
+        for (display, vcp_code), value in updates:
+            by_display.setdefault(display, []).append((vcp_code, value))
 
-                # Don't wait for completion - fire and forget
-                for p in processes:
-                    try:
-                        p.wait(timeout=0.01)
-                    except subprocess.TimeoutExpired:
-                        pass
+        for display, values in by_display.items():
+            if self.ddc.set_vcp_values_direct(display, values):
+                # The display needs the DDC/CI wait before the next write
+                self._direct_writes[display] = time.monotonic()
+                continue
+            try:
+                self._inflight[display] = self.ddc.set_vcp_values_async(display, values)
+            except OSError:
+                failed += [((display, vcp_code), value) for vcp_code, value in values]
+
+        if failed:
+            for key, value in failed:
+                self._last_sent.pop(key, None)
+                # Keep any newer value queued while we were sending
+                self._pending_updates.setdefault(key, value)
+            self._wake.set()
+            self._notify_change()
+
+        return not failed
@@ -2,18 +2,11 @@
 Main CLI entry point for monitor settings control
 """
 
-import subprocess
+import importlib.util
 import sys
 from typing import Any
 
-
-def check_ddcutil() -> bool:
-    """Check if ddcutil is available on the system"""
-    try:
-        subprocess.run(["which", "ddcutil"], capture_output=True, check=True, timeout=2)
-        return True
-    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-        return False
+from .base import check_ddcutil
 
 
 def print_setup_instructions() -> None:
@@ -42,12 +35,16 @@ def main() -> None:
     # Try to use blessed controller first, fall back to curses if unavailable
     controller: Any = None
 
-    try:
-        # Try importing blessed controller
-        from .controllers.backlight.blessed import BlessedBacklightController
+    # Look blessed up without importing it, so a missing install costs no failed import
+    if importlib.util.find_spec("blessed") is not None:
+        try:
+            from .controllers.backlight.blessed import BlessedBacklightController
+
+            controller = BlessedBacklightController()
+        except ImportError:
+            pass
 
-        controller = BlessedBacklightController()
-    except ImportError:
+    if controller is None:
         # Fall back to curses controller
         try:
             from .controllers.backlight.curses import CursesBacklightController
@@ -2,8 +2,10 @@
 Base class for backlight/brightness controllers
 """
 
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from ...base import AsyncDDCWorker, DDCInterface
 
@@ -17,15 +19,27 @@ class BacklightController(ABC):
     # VCP code for brightness control
     BRIGHTNESS_VCP_CODE = "0x10"
 
+    # Upper bound on concurrent ddcutil reads during initialize
+    MAX_READ_WORKERS = 8
+
+    # How long the main loop may block waiting for input when nothing is
+    # outstanding; nothing on screen can change without input
+    IDLE_TIMEOUT = 1.0
+
     def __init__(self) -> None:
+        # Set whenever the interface needs redrawing
+        self._dirty = threading.Event()
+        self._dirty.set()
+
         self.ddc = DDCInterface()
-        self.worker = AsyncDDCWorker(self.ddc)
+        self.worker = AsyncDDCWorker(self.ddc, on_change=self._dirty.set)
 
         # Display state
         self.displays: List[int] = []
         self.current_brightness: Dict[int, int] = {}
         self.max_brightness: Dict[int, int] = {}
         self.target_brightness: Dict[int, int] = {}
+        self.last_sent_brightness: Dict[int, int] = {}  # As last shown in the UI
         self.selected_displays: List[int] = []  # Empty means all displays
 
         # Control settings
@@ -46,18 +60,27 @@ class BacklightController(ABC):
         if not self.displays:
             return False
 
-        # Get initial brightness for all displays
-        for display in self.displays:
-            current, max_val = self.get_brightness(display)
+        # Get initial brightness for all displays concurrently, each read
+        # waits on its own display's I2C round trip
+        workers = min(self.MAX_READ_WORKERS, len(self.displays))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            readings = list(executor.map(self.get_brightness, self.displays))
+
+        for display, (current, max_val) in zip(self.displays, readings):
             if current is not None and max_val is not None:
                 self.current_brightness[display] = current
                 self.max_brightness[display] = max_val
                 self.target_brightness[display] = current
+                # The display already has this value, so flush_targets skips it
+                self.worker._last_sent[(display, self.BRIGHTNESS_VCP_CODE)] = current
             else:
                 # Use defaults if can't read
                 self.current_brightness[display] = 50
                 self.max_brightness[display] = 100
                 self.target_brightness[display] = 50
+                # Treat the placeholder as sent too, so the display is left
+                # alone until the user actually adjusts it
+                self.worker._last_sent[(display, self.BRIGHTNESS_VCP_CODE)] = 50
 
         return True
 
@@ -83,9 +106,23 @@ class BacklightController(ABC):
         """
         self.worker.queue_update(display, self.BRIGHTNESS_VCP_CODE, value)
 
+    def set_brightness_many(self, values: Dict[int, int]) -> None:
+        """
+        Set brightness for several displays in one batch (queued for async sending)
+
+        Args:
+            values: Mapping of display number to brightness value
+        """
+        code = self.BRIGHTNESS_VCP_CODE
+        self.worker.queue_update_batch(
+            {(display, code): value for display, value in values.items()}
+        )
+
     def adjust_brightness(self, delta: int) -> None:
         """
-        Adjust brightness for selected displays
+        Adjust target brightness for selected displays
+
+        The new targets are sent by the next flush_targets call.
 
         Args:
             delta: Amount to adjust (positive or negative)
@@ -94,9 +131,30 @@ class BacklightController(ABC):
 
         for display in displays_to_adjust:
             new_val = self.target_brightness[display] + delta
-            new_val = max(0, min(new_val, self.max_brightness[display]))
-            self.target_brightness[display] = new_val
-            self.set_brightness(display, new_val)
+            max_val = self.max_brightness[display]
+            # Clamp with comparisons, skipping the max()/min() calls on this hot path
+            self.target_brightness[display] = (
+                0 if new_val < 0 else max_val if new_val > max_val else new_val
+            )
+
+        self._dirty.set()
+
+    def flush_targets(self) -> None:
+        """
+        Queue target brightness for every display whose target differs from
+        the value last sent
+
+        Controllers call this once per pass of their main loop, so a burst of
+        adjustments is queued as a single update per display.
+        """
+        sent = self.worker._last_sent
+        changed = {
+            display: target
+            for display, target in self.target_brightness.items()
+            if sent.get((display, self.BRIGHTNESS_VCP_CODE)) != target
+        }
+        if changed:
+            self.set_brightness_many(changed)
 
     def select_display(self, display_num: Optional[int] = None) -> None:
         """
@@ -110,13 +168,33 @@ class BacklightController(ABC):
         elif display_num in self.displays:
             self.selected_displays = [display_num]
 
+        self._dirty.set()
+
+    def _frame_state(self) -> Tuple[Any, ...]:
+        """
+        Snapshot of everything the interface is drawn from
+
+        Controllers compare this against the previous frame's snapshot and
+        skip redrawing when nothing changed.
+        """
+        sent = self.worker._last_sent
+        return (
+            tuple(self.target_brightness.items()),
+            tuple(self.max_brightness.items()),
+            tuple(self.last_sent_brightness.items()),
+            tuple(sent.get((d, self.BRIGHTNESS_VCP_CODE)) for d in self.displays),
+            tuple(self.selected_displays),
+            self.increment,
+        )
+
     def start_worker(self) -> None:
         """Start the async DDC worker thread"""
         self.worker.start()
 
     def stop_worker(self) -> None:
-        """Stop the async DDC worker thread"""
+        """Stop the async DDC worker thread and release the display devices"""
         self.worker.stop()
+        self.ddc.close()
 
     @abstractmethod
     def run(self) -> None:
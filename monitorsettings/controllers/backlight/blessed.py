@@ -2,8 +2,12 @@
 Blessed-based backlight controller with inline terminal UI
 """
 
+import functools
+import os
+import select
+import sys
 import time
-from typing import Any, Dict
+from typing import Any, List, Optional, Tuple
 
 from blessed import Terminal
 
@@ -16,11 +20,53 @@ class BlessedBacklightController(BacklightController):
     Does not take over the entire screen, updates in place.
     """
 
+    # Progress bar, sliced per frame instead of rebuilt with string repetition
+    BAR_WIDTH = 40
+    _BAR_FULL = "█" * BAR_WIDTH
+    _BAR_EMPTY = "·" * BAR_WIDTH
+
     def __init__(self) -> None:
         super().__init__()
         self.term = Terminal()
         self.interface_lines = 0
-        self.last_sent_brightness: Dict[int, int] = {}
+        self._start_row: Optional[int] = None  # Screen row of the first interface line
+        self._prev_lines: List[str] = []
+        self._prev_state: Optional[Tuple[Any, ...]] = None
+
+        # Self-pipe the worker writes to, waking the input wait to redraw
+        self._wake_r: Optional[int] = None
+        self._wake_w: Optional[int] = None
+        self.worker.on_change = self._on_worker_change
+
+        # Color palette
+        self.maroon = self.term.color_rgb(139, 69, 89)
+        self.deep_wine = self.term.color_rgb(88, 44, 55)
+        self.rose_gold = self.term.color_rgb(183, 110, 121)
+        self.sage = self.term.color_rgb(87, 116, 90)
+        self.warm_gray = self.term.color_rgb(120, 113, 108)
+        self.cream = self.term.color_rgb(242, 234, 220)
+
+        # Static lines never change between frames, so render them once
+        self._header_rule = self.deep_wine("=" * 60)
+        self._header_title = self._join_runs(
+            (self.maroon, "       "), (self.cream, " Brightness Control "), (self.maroon, "       ")
+        )
+        self._separator = self.warm_gray("-" * 60)
+        self._footer = self._join_runs(
+            (self.warm_gray, "["),
+            (self.cream, "←/→"),
+            (self.warm_gray, "] Brightness  ["),
+            (self.cream, "↑/↓"),
+            (self.warm_gray, "] Step size  ["),
+            (self.cream, "0-9"),
+            (self.warm_gray, "] Select  ["),
+            (self.cream, "q/ESC"),
+            (self.warm_gray, "] Quit"),
+        )
+
+        # A display's bar line only depends on its own values, so most frames
+        # reuse the lines of displays that didn't change
+        self._bar_line = functools.lru_cache(maxsize=128)(self._format_bar_line)
 
     def run(self) -> None:
         """Main run loop with blessed terminal handling"""
@@ -45,47 +91,97 @@ class BlessedBacklightController(BacklightController):
         time.sleep(1)
 
         # Start background worker
+        self._open_wake_pipe()
         self.start_worker()
 
         # Enter cbreak mode for single key input
         with self.term.cbreak(), self.term.hidden_cursor():
-            last_draw = 0.0
-
+            # Redraw only when something changed
             while self.running:
-                # Draw interface at controlled rate
-                current_time = time.time()
-                if current_time - last_draw >= 0.1:
+                # Queue the net result of the last round of input
+                self.flush_targets()
+
+                if self._dirty.is_set():
+                    self._dirty.clear()
                     self.draw_interface()
-                    last_draw = current_time
 
-                # Check for key press (non-blocking with timeout)
-                key = self.term.inkey(timeout=0.05)
+                # Keys blessed already buffered (e.g. read while get_location
+                # waited for the cursor report) are invisible to select, so
+                # take those first and only then sleep until a key arrives or
+                # the worker reports a change
+                key = self.term.inkey(timeout=0)
+                if not key and self._wait_for_input(self.IDLE_TIMEOUT):
+                    key = self.term.inkey(timeout=0)
 
-                if key:
+                while key:
                     self.handle_key(key)
+                    self._dirty.set()
+                    # Drain the rest of a key-repeat burst so it costs one redraw
+                    key = self.term.inkey(timeout=0) if self.running else None
 
         self.cleanup()
 
+    def _open_wake_pipe(self) -> None:
+        """Create the non-blocking self-pipe used to wake the input wait"""
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+
+    def _close_wake_pipe(self) -> None:
+        """Close the self-pipe, if open"""
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    def _on_worker_change(self) -> None:
+        """Mark the interface dirty and wake the input wait (worker thread)"""
+        self._dirty.set()
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b"\0")
+            except OSError:
+                pass  # Pipe full, a wake-up is already pending
+
+    def _wait_for_input(self, timeout: float) -> bool:
+        """
+        Block until a key is ready, the worker wakes us, or timeout passes
+
+        Args:
+            timeout: Maximum time to wait, in seconds
+
+        Returns:
+            True if there is keyboard input to read
+        """
+        fds = [sys.stdin.fileno()]
+        if self._wake_r is not None:
+            fds.append(self._wake_r)
+
+        ready, _, _ = select.select(fds, [], [], timeout)
+
+        if self._wake_r is not None and self._wake_r in ready:
+            try:
+                while os.read(self._wake_r, 4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+        return fds[0] in ready
+
     def draw_interface(self) -> None:
         """Draw interface using blessed terminal with maroon/port color palette"""
-        # Move cursor up to overwrite previous interface
-        if self.interface_lines > 0:
-            print(self.term.move_up * self.interface_lines, end="")
+        # Nothing to do if the frame would be identical to the last one
+        state = self._frame_state()
+        if state == self._prev_state:
+            return
+        self._prev_state = state
 
         lines = []
 
-        # Color palette
-        maroon = self.term.color_rgb(139, 69, 89)
-        deep_wine = self.term.color_rgb(88, 44, 55)
-        rose_gold = self.term.color_rgb(183, 110, 121)
-        sage = self.term.color_rgb(87, 116, 90)
-        warm_gray = self.term.color_rgb(120, 113, 108)
-        cream = self.term.color_rgb(242, 234, 220)
-
         # Header
-        lines.append(deep_wine("=" * 60))
-        lines.append(maroon("       ") + cream(" Brightness Control ") + maroon("       "))
-        lines.append(deep_wine("=" * 60))
+        lines.append(self._header_rule)
+        lines.append(self._header_title)
+        lines.append(self._header_rule)
         lines.append("")
 
         # Mode indicator
@@ -93,60 +189,135 @@ class BlessedBacklightController(BacklightController):
             mode = f"Mode: Display {', '.join(str(d) for d in self.selected_displays)}"
         else:
             mode = "Mode: ALL displays"
-        lines.append(rose_gold(mode) + warm_gray(" | ") + cream(f"Step: {self.increment}"))
+        lines.append(
+            self._join_runs(
+                (self.rose_gold, mode),
+                (self.warm_gray, " | "),
+                (self.cream, f"Step: {self.increment}"),
+            )
+        )
         lines.append("")
 
         # Display bars
         for display in self.displays:
             target = self.target_brightness[display]
-            max_val = self.max_brightness[display]
-            percent = int(target * 100 / max_val) if max_val > 0 else 0
-
-            # Selection indicator
             is_selected = not self.selected_displays or display in self.selected_displays
-            indicator = rose_gold(">") if is_selected else warm_gray(" ")
-
-            # Progress bar
-            bar_width = 40
-            filled = int(target * bar_width / max_val) if max_val > 0 else 0
-
-            filled_bar = rose_gold("█" * filled)
-            empty_bar = warm_gray("·" * (bar_width - filled))
-
-            # Pending indicator
-            pending = sage("*") if target != self.last_sent_brightness.get(display, target) else " "
 
-            # Update last sent for UI purposes
+            # Update last sent for UI purposes, before the pending marker is
+            # worked out from it, so the frame the worker's change wakes us
+            # for already shows the marker cleared
             if target == self.worker._last_sent.get((display, self.BRIGHTNESS_VCP_CODE), -1):
                 self.last_sent_brightness[display] = target
+            is_pending = target != self.last_sent_brightness.get(display, target)
 
-            # Compose line
-            display_text = cream(f"Display {display}:")
-            percent_text = rose_gold(f"{percent:3d}%")
             lines.append(
-                f"{indicator} {display_text} [{filled_bar}{empty_bar}] {percent_text} {pending}"
+                self._bar_line(
+                    display, target, self.max_brightness[display], is_selected, is_pending
+                )
             )
 
         lines.append("")
-        lines.append(warm_gray("-" * 60))
-        lines.append(
-            warm_gray("[")
-            + cream("←/→")
-            + warm_gray("] Brightness  [")
-            + cream("↑/↓")
-            + warm_gray("] Step size  [")
-            + cream("0-9")
-            + warm_gray("] Select  [")
-            + cream("q/ESC")
-            + warm_gray("] Quit")
-        )
+        lines.append(self._separator)
+        lines.append(self._footer)
+
+        # Build the whole frame so it goes out in a single write
+        out = []
+
+        # Move cursor back to the top of the previous interface
+        first_frame = self.interface_lines == 0
+        if not first_frame:
+            out.append(self._rewind())
 
-        # Print all lines, clearing to end of line for each
-        for line in lines:
-            print(line + self.term.clear_eol)
+        # Only rewrite lines that changed since the last frame
+        for i, line in enumerate(lines):
+            if i < len(self._prev_lines) and self._prev_lines[i] == line:
+                out.append("\n")
+            else:
+                out.append(line + self.term.clear_eol + "\n")
 
+        sys.stdout.write("".join(out))
+        sys.stdout.flush()
+
+        self._prev_lines = lines
         self.interface_lines = len(lines)
 
+        if first_frame and self._start_row is None:
+            # Measured after drawing, so any scrolling of the first frame is
+            # accounted for; the terminal reports -1 if it didn't answer
+            row, _ = self.term.get_location(timeout=0.1)
+            if row >= 0:
+                self._start_row = row - self.interface_lines
+
+    def _rewind(self) -> str:
+        """Escape sequence that moves the cursor to the top of the interface"""
+        if self._start_row is not None:
+            # One absolute move, however tall the interface is
+            return self.term.move_yx(self._start_row, 0)
+        # A single parameterized cursor-up (CSI n A) rather than n separate ones
+        return self.term.move_up(self.interface_lines)
+
+    def _format_bar_line(
+        self, display: int, target: int, max_val: int, is_selected: bool, is_pending: bool
+    ) -> str:
+        """
+        Render the brightness bar line for one display
+
+        Args:
+            display: Display number
+            target: Target brightness
+            max_val: Maximum brightness
+            is_selected: Whether the display is being controlled
+            is_pending: Whether the target hasn't been sent yet
+        """
+        normal = self.term.normal
+        percent = int(target * 100 / max_val) if max_val > 0 else 0
+
+        # Selection indicator
+        indicator = (self.rose_gold, ">") if is_selected else (self.warm_gray, " ")
+
+        # Progress bar
+        filled = int(target * self.BAR_WIDTH / max_val) if max_val > 0 else 0
+
+        # Pending indicator
+        pending = (self.sage, "*") if is_pending else (normal, " ")
+
+        return self._join_runs(
+            indicator,
+            (normal, " "),
+            (self.cream, f"Display {display}:"),
+            (normal, " ["),
+            (self.rose_gold, self._BAR_FULL[:filled]),
+            (self.warm_gray, self._BAR_EMPTY[filled:]),
+            (normal, "] "),
+            (self.rose_gold, f"{percent:3d}%"),
+            (normal, " "),
+            pending,
+        )
+
+    def _join_runs(self, *runs: Tuple[str, str]) -> str:
+        """
+        Join (style, text) runs into one line, emitting each style escape only
+        when it changes and a single reset at the end of the line
+
+        Args:
+            runs: (style, text) pairs, where style is a color from the palette
+                  or the terminal's normal attribute for plain text
+        """
+        normal = self.term.normal
+        parts = []
+        current = normal
+
+        for style, text in runs:
+            if style != current:
+                parts.append(style)
+                current = style
+            parts.append(text)
+
+        if current != normal:
+            parts.append(normal)
+
+        return "".join(parts)
+
     def handle_key(self, key: Any) -> None:
         """Handle keyboard input"""
         if key == "q" or key == "Q" or key.name == "KEY_ESCAPE":
@@ -171,12 +342,13 @@ class BlessedBacklightController(BacklightController):
     def cleanup(self) -> None:
         """Clean up on exit"""
         self.stop_worker()
+        self._close_wake_pipe()
 
         # Clear the interface area
         if self.interface_lines > 0:
-            print(self.term.move_up * self.interface_lines, end="")
-            for _ in range(self.interface_lines):
-                print(self.term.clear_eol)
-            print(self.term.move_up * self.interface_lines, end="")
+            rewind = self._rewind()
+            blank = (self.term.clear_eol + "\n") * self.interface_lines
+            sys.stdout.write(rewind + blank + rewind)
+            sys.stdout.flush()
 
         print("\nBrightness controller exited.")
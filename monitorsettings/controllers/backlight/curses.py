@@ -4,8 +4,9 @@ Curses-based backlight controller with full-screen terminal UI
 
 import curses
 import os
+import signal
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .base import BacklightController
 
@@ -16,15 +17,47 @@ class CursesBacklightController(BacklightController):
     Takes over the entire terminal screen like vim/nano.
     """
 
+    # Rules and progress bar at their widest, sliced to fit on each frame
+    _RULE = "=" * 40
+    _DIVIDER = "-" * 40
+    _BAR_FULL = "#" * 50
+    _BAR_EMPTY = "-" * 50
+
+    # How long getch may block while updates are waiting: curses has no way
+    # to wake on the worker's change, so it polls until the pending marker clears
+    BUSY_TIMEOUT = 0.05
+
+    # Key code -> (method name, argument) for handle_key
+    _KEY_DISPATCH: Dict[int, Tuple[str, Optional[int]]] = {
+        ord("q"): ("_quit", None),
+        ord("Q"): ("_quit", None),
+        27: ("_quit", None),  # ESC
+        curses.KEY_UP: ("_nudge_brightness", 1),
+        curses.KEY_RIGHT: ("_nudge_brightness", 1),
+        curses.KEY_DOWN: ("_nudge_brightness", -1),
+        curses.KEY_LEFT: ("_nudge_brightness", -1),
+        ord("+"): ("_nudge_increment", 1),
+        ord("="): ("_nudge_increment", 1),
+        ord("-"): ("_nudge_increment", -1),
+        ord("_"): ("_nudge_increment", -1),
+        ord("0"): ("select_display", None),
+        **{ord(str(n)): ("select_display", n) for n in range(1, 10)},
+    }
+
     def __init__(self) -> None:
         super().__init__()
         self.stdscr: Optional[Any] = None
-        self.last_sent_brightness: Dict[int, int] = {}
+        self._prev_lines: List[str] = []
+        self._prev_size: Optional[Tuple[int, int]] = None
+        self._prev_state: Optional[Tuple[Any, ...]] = None
+
+        # Sets up and restores the terminal around the main loop
+        self._wrapper: Callable[[Callable[[Any], None]], Any] = curses.wrapper
 
     def run(self) -> None:
         """Main entry point that sets up curses wrapper"""
         try:
-            curses.wrapper(self._run_curses)
+            self._wrapper(self._run_curses)
         except KeyboardInterrupt:
             pass
 
@@ -51,28 +84,46 @@ class CursesBacklightController(BacklightController):
         # Start background worker
         self.start_worker()
 
-        # Track last draw time to limit refresh rate
-        last_draw = 0.0
-        draw_interval = 0.05  # 20 FPS max
-
-        # Main loop
-        while self.running:
-            current_time = time.time()
-
-            # Only redraw at controlled rate
-            if current_time - last_draw >= draw_interval:
-                self.draw_interface()
-                last_draw = current_time
+        # Ctrl-C ends the loop like 'q' does, so cleanup always stops the worker
+        previous_handler = signal.signal(signal.SIGINT, self._handle_sigint)
+        try:
+            # Main loop, redrawing only when something changed
+            while self.running:
+                # Queue the net result of the last round of input
+                self.flush_targets()
 
-            try:
-                key = stdscr.getch()
-                self.handle_key(key)
-            except KeyboardInterrupt:
-                break
-            except Exception:
-                pass
+                if self._dirty.is_set():
+                    self._dirty.clear()
+                    self.draw_interface()
 
-        self.cleanup()
+                try:
+                    # Block until input arrives, briefly while updates are in flight
+                    stdscr.timeout(int(self._input_timeout() * 1000))
+                    key = stdscr.getch()
+                    if key != -1:
+                        self.handle_key(key)
+                        self._dirty.set()
+                except Exception:
+                    pass
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+            self.cleanup()
+
+    def _input_timeout(self) -> float:
+        """
+        Get how long the main loop may block waiting for input
+
+        Returns:
+            BUSY_TIMEOUT while a redraw or an update is outstanding, otherwise
+            IDLE_TIMEOUT
+        """
+        if self.worker.has_pending() or self._dirty.is_set():
+            return self.BUSY_TIMEOUT
+        return self.IDLE_TIMEOUT
+
+    def _handle_sigint(self, signum: int, frame: Any) -> None:
+        """Stop the main loop on Ctrl-C instead of raising KeyboardInterrupt"""
+        self.running = False
 
     def _init_displays(self) -> bool:
         """Initialize display detection and brightness reading"""
@@ -108,13 +159,72 @@ class CursesBacklightController(BacklightController):
         assert self.stdscr is not None
         height, width = self.stdscr.getmaxyx()
 
+        # Nothing to do if the frame would be identical to the last one
+        state = (self._frame_state(), height, width)
+        if state == self._prev_state:
+            return
+        self._prev_state = state
+
+        # Update last sent for UI purposes, before the pending markers are
+        # worked out from it
+        sent = self.worker._last_sent
+        for display in self.displays:
+            target = self.target_brightness[display]
+            if target == sent.get((display, self.BRIGHTNESS_VCP_CODE), -1):
+                self.last_sent_brightness[display] = target
+
         # Build the entire screen in memory first
+        lines = self._compute_paint(width)
+
+        # Start from a blank window on the first frame or after a resize
+        if (height, width) != self._prev_size:
+            self.stdscr.erase()  # This is faster than clear()
+            self._prev_lines = []
+            self._prev_size = (height, width)
+
+        # Only rewrite rows that changed since the last frame
+        rows = [line[: width - 1] for line in lines[: height - 1]]
+        for i, line in enumerate(rows):
+            if i < len(self._prev_lines) and self._prev_lines[i] == line:
+                continue
+            try:
+                self.stdscr.addstr(i, 0, line)
+                self.stdscr.clrtoeol()
+            except Exception:
+                pass
+
+        # Clear rows left over from a longer previous frame
+        for i in range(len(rows), len(self._prev_lines)):
+            try:
+                self.stdscr.move(i, 0)
+                self.stdscr.clrtoeol()
+            except Exception:
+                pass
+
+        self._prev_lines = rows
+
+        # Stage the window, then push the whole diff to the terminal in one pass
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def _compute_paint(self, width: int) -> List[str]:
+        """
+        Build the lines of the next frame, before they are clipped to the window
+
+        Only reads controller state, so it can be called without a window.
+
+        Args:
+            width: Window width, in columns
+
+        Returns:
+            One string per screen row, top to bottom
+        """
         lines = []
 
         # Header
         header = "Brightness Control Center"
         lines.append(header.center(width - 1))
-        lines.append("=" * min(width - 1, 40))
+        lines.append(self._RULE[: width - 1])
         lines.append("")
 
         # Controls
@@ -134,7 +244,7 @@ class CursesBacklightController(BacklightController):
         else:
             lines.append("Mode: Controlling ALL displays")
         lines.append("")
-        lines.append("-" * min(width - 1, 40))
+        lines.append(self._DIVIDER[: width - 1])
         lines.append("")
 
         # Display brightness bars
@@ -153,54 +263,47 @@ class CursesBacklightController(BacklightController):
             lines.append(label)
 
             # Progress bar
-            bar_width = min(width - 20, 50)
+            bar_width = max(0, min(width - 20, 50))
             filled = int(target * bar_width / max_val) if max_val > 0 else 0
 
-            bar = "[" + "#" * filled + "-" * (bar_width - filled) + "]"
-            status = f"{percent:3d}% ({target}/{max_val})"
-
             # Add pending indicator if update hasn't been sent yet
-            if target != self.last_sent_brightness.get(display, target):
-                status += " *"
-            else:
-                # Update last sent for UI purposes
-                if target == self.worker._last_sent.get((display, self.BRIGHTNESS_VCP_CODE), -1):
-                    self.last_sent_brightness[display] = target
-
-            lines.append(f"    {bar} {status}")
+            pending = " *" if target != self.last_sent_brightness.get(display, target) else ""
+
+            # Join the fragments once instead of concatenating piece by piece
+            parts = [
+                "    [",
+                self._BAR_FULL[:filled],
+                self._BAR_EMPTY[: bar_width - filled],
+                "] ",
+                f"{percent:3d}% ({target}/{max_val})",
+                pending,
+            ]
+            lines.append("".join(parts))
             lines.append("")
 
         # Footer
         lines.append(f"Step: {self.increment}")
 
-        # Draw all at once using erase() instead of clear()
-        self.stdscr.erase()  # This is faster than clear()
-        for i, line in enumerate(lines):
-            if i < height - 1:
-                try:
-                    self.stdscr.addstr(i, 0, line[: width - 1])
-                except Exception:
-                    pass
-
-        self.stdscr.refresh()
+        return lines
 
     def handle_key(self, key: int) -> None:
         """Handle keyboard input"""
-        if key == ord("q") or key == ord("Q") or key == 27:  # 27 is ESC
-            self.running = False
-        elif key == curses.KEY_UP or key == curses.KEY_RIGHT:
-            self.adjust_brightness(self.increment)
-        elif key == curses.KEY_DOWN or key == curses.KEY_LEFT:
-            self.adjust_brightness(-self.increment)
-        elif key == ord("+") or key == ord("="):
-            self.increment = min(25, self.increment + 1)
-        elif key == ord("-") or key == ord("_"):
-            self.increment = max(1, self.increment - 1)
-        elif key == ord("0"):
-            self.select_display(None)
-        elif ord("1") <= key <= ord("9"):
-            display_num = key - ord("0")
-            self.select_display(display_num)
+        action = self._KEY_DISPATCH.get(key)
+        if action is not None:
+            method, arg = action
+            getattr(self, method)(arg)
+
+    def _quit(self, _arg: Optional[int] = None) -> None:
+        """Stop the main loop"""
+        self.running = False
+
+    def _nudge_brightness(self, direction: int) -> None:
+        """Adjust brightness by one step in the given direction (1 or -1)"""
+        self.adjust_brightness(direction * self.increment)
+
+    def _nudge_increment(self, delta: int) -> None:
+        """Change the step size, keeping it between 1 and 25"""
+        self.increment = max(1, min(25, self.increment + delta))
 
     def cleanup(self) -> None:
         """Clean up on exit"""
@@ -3,10 +3,12 @@ Shared pytest fixtures and configuration
 """
 
 import sys
-from unittest.mock import MagicMock
+from types import SimpleNamespace
 
 import pytest
 
+from monitorsettings.base import check_ddcutil
+
 
 @pytest.fixture
 def mock_subprocess(mocker):
@@ -17,46 +19,51 @@ def mock_subprocess(mocker):
 
 
 @pytest.fixture
-def mock_ddcutil_available(mock_subprocess):
+def mock_ddcutil_available(mocker, mock_subprocess):
     """Mock ddcutil as available on system"""
-    mock_subprocess["run"].return_value = MagicMock(returncode=0)
+    mocker.patch("shutil.which", return_value="/usr/bin/ddcutil")
+    mock_subprocess["run"].return_value = SimpleNamespace(returncode=0, stdout="")
     return mock_subprocess
 
 
 @pytest.fixture
-def mock_displays_detected(mock_subprocess):
+def mock_i2c_unavailable(mocker):
+    """Make /dev/i2c-N fail to open, so DirectDDC never touches the real buses"""
+    return mocker.patch("os.open", side_effect=FileNotFoundError)
+
+
+@pytest.fixture
+def mock_displays_detected(mock_ddcutil_available, mock_i2c_unavailable):
     """Mock successful display detection"""
 
     def run_side_effect(*args, **kwargs):
-        if "which" in args[0]:
-            return MagicMock(returncode=0)
-        elif "detect" in args[0]:
-            return MagicMock(
-                stdout="Display 1\nI2C bus: /dev/i2c-1\nDisplay 2\nI2C bus: /dev/i2c-2"
+        if "detect" in args[0]:
+            return SimpleNamespace(
+                returncode=0,
+                stdout="Display 1\nI2C bus: /dev/i2c-1\nDisplay 2\nI2C bus: /dev/i2c-2",
             )
         elif "getvcp" in args[0]:
-            return MagicMock(
-                stdout="VCP code 0x10 (Brightness): current value = 50, max value = 100"
+            return SimpleNamespace(
+                returncode=0,
+                stdout="VCP code 0x10 (Brightness): current value = 50, max value = 100",
             )
-        return MagicMock(returncode=0)
+        return SimpleNamespace(returncode=0, stdout="")
 
-    mock_subprocess["run"].side_effect = run_side_effect
-    return mock_subprocess
+    mock_ddcutil_available["run"].side_effect = run_side_effect
+    return mock_ddcutil_available
 
 
 @pytest.fixture
-def mock_no_displays(mock_subprocess):
+def mock_no_displays(mock_ddcutil_available):
     """Mock no displays detected"""
 
     def run_side_effect(*args, **kwargs):
-        if "which" in args[0]:
-            return MagicMock(returncode=0)
-        elif "detect" in args[0]:
-            return MagicMock(stdout="No displays found")
-        return MagicMock(returncode=1)
+        if "detect" in args[0]:
+            return SimpleNamespace(returncode=0, stdout="No displays found")
+        return SimpleNamespace(returncode=1, stdout="")
 
-    mock_subprocess["run"].side_effect = run_side_effect
-    return mock_subprocess
+    mock_ddcutil_available["run"].side_effect = run_side_effect
+    return mock_ddcutil_available
 
 
 @pytest.fixture(autouse=True)
@@ -65,6 +72,9 @@ def reset_imports():
     # Store original modules
     original_modules = sys.modules.copy()
 
+    # Forget any cached ddcutil lookup so each test sees its own mocks
+    check_ddcutil.cache_clear()
+
     yield
 
     # Restore original modules
@@ -14,17 +14,16 @@ class TestCLI:
 
     def test_check_ddcutil_available(self, mocker):
         """Test ddcutil check when available"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_which = mocker.patch("shutil.which", return_value="/usr/bin/ddcutil")
 
         result = check_ddcutil()
 
         assert result is True
+        mock_which.assert_called_once_with("ddcutil")
 
     def test_check_ddcutil_not_available(self, mocker):
         """Test ddcutil check when not available"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = FileNotFoundError()
+        mocker.patch("shutil.which", return_value=None)
 
         result = check_ddcutil()
 
@@ -49,6 +49,28 @@ class TestFallback:
 
         mock_controller.run.assert_called_once()
 
+    def test_curses_fallback_without_blessed(self, mocker):
+        """Test fallback to curses when blessed is not installed"""
+        mocker.patch("monitorsettings.cli.check_ddcutil", return_value=True)
+        mocker.patch("importlib.util.find_spec", return_value=None)
+        mock_blessed = mocker.patch(
+            "monitorsettings.controllers.backlight.blessed.BlessedBacklightController"
+        )
+
+        # Mock curses controller
+        mock_controller = MagicMock()
+        mocker.patch(
+            "monitorsettings.controllers.backlight.curses.CursesBacklightController",
+            return_value=mock_controller,
+        )
+
+        from monitorsettings.cli import main
+
+        main()
+
+        mock_blessed.assert_not_called()
+        mock_controller.run.assert_called_once()
+
     def test_no_controllers_available(self, mocker):
         """Test error when both controllers are unavailable"""
         mocker.patch("monitorsettings.cli.check_ddcutil", return_value=True)
@@ -0,0 +1,132 @@
+"""
+Unit tests for the shared backlight controller logic using pytest
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from monitorsettings.controllers.backlight.base import BacklightController
+
+
+class StubBacklightController(BacklightController):
+    """Concrete controller with no user interface, for testing the base class"""
+
+    def run(self) -> None:
+        pass
+
+    def cleanup(self) -> None:
+        pass
+
+
+@pytest.fixture
+def controller():
+    """Fixture providing a BacklightController with no user interface"""
+    return StubBacklightController()
+
+
+class TestBacklightController:
+    """Test cases for BacklightController"""
+
+    def test_initialize_reads_all_displays(self, controller, mock_displays_detected):
+        """Test that initialize reads brightness for every detected display"""
+        assert controller.initialize() is True
+
+        assert controller.displays == [1, 2]
+        assert controller.current_brightness == {1: 50, 2: 50}
+        assert controller.max_brightness == {1: 100, 2: 100}
+        assert controller.target_brightness == {1: 50, 2: 50}
+
+    def test_initialize_caps_read_workers(self, controller, mocker):
+        """Test that the concurrent reads are capped for many displays"""
+        mocker.patch.object(controller.ddc, "check_ddcutil", return_value=True)
+        mocker.patch.object(controller.ddc, "detect_displays", return_value=list(range(1, 21)))
+        mocker.patch.object(controller, "get_brightness", return_value=(50, 100))
+        mock_pool = mocker.patch(
+            "monitorsettings.controllers.backlight.base.ThreadPoolExecutor",
+            wraps=ThreadPoolExecutor,
+        )
+
+        assert controller.initialize() is True
+
+        mock_pool.assert_called_once_with(max_workers=controller.MAX_READ_WORKERS)
+        assert len(controller.current_brightness) == 20
+
+    def test_initialize_marks_read_brightness_as_sent(self, controller, mock_displays_detected):
+        """Test that brightness read at startup is not sent back to the displays"""
+        controller.initialize()
+
+        controller.flush_targets()
+
+        assert controller.worker._pending_updates == {}
+
+    def test_initialize_leaves_unread_display_alone(self, controller, mocker):
+        """Test that a display whose startup read failed is not sent its placeholder"""
+        mocker.patch.object(controller.ddc, "check_ddcutil", return_value=True)
+        mocker.patch.object(controller.ddc, "detect_displays", return_value=[1, 2])
+        mocker.patch.object(
+            controller,
+            "get_brightness",
+            side_effect=lambda d: (70, 100) if d == 1 else (None, None),
+        )
+        controller.initialize()
+
+        controller.flush_targets()
+
+        assert controller.target_brightness == {1: 70, 2: 50}
+        assert controller.worker._pending_updates == {}
+
+        # Adjusting it does send the new value
+        controller.select_display(2)
+        controller.adjust_brightness(5)
+        controller.flush_targets()
+
+        assert controller.worker._pending_updates == {(2, "0x10"): 55}
+
+    def test_adjust_brightness_defers_sending(self, controller):
+        """Test that adjusting only moves the target until targets are flushed"""
+        controller.displays = [1, 2]
+        controller.target_brightness = {1: 50, 2: 50}
+        controller.max_brightness = {1: 100, 2: 100}
+        controller.worker._last_sent = {(1, "0x10"): 50, (2, "0x10"): 50}
+        controller.selected_displays = [1]
+
+        for _ in range(3):
+            controller.adjust_brightness(5)
+        assert controller.worker._pending_updates == {}
+
+        controller.flush_targets()
+
+        # Only the changed display is queued, with the net result of the burst
+        assert controller.worker._pending_updates == {(1, "0x10"): 65}
+
+    def test_flush_targets_queues_one_batch(self, controller, mocker):
+        """Test that every changed display is queued in one batch"""
+        controller.target_brightness = {1: 60, 2: 70, 3: 50}
+        controller.worker._last_sent = {(3, "0x10"): 50}
+        mock_batch = mocker.patch.object(controller.worker, "queue_update_batch")
+
+        controller.flush_targets()
+
+        mock_batch.assert_called_once_with({(1, "0x10"): 60, (2, "0x10"): 70})
+
+    @pytest.mark.parametrize("delta,expected", [(-80, 0), (-10, 40), (10, 60), (80, 100)])
+    def test_adjust_brightness_clamps(self, controller, delta, expected):
+        """Test that targets stay between 0 and the display's maximum"""
+        controller.displays = [1]
+        controller.target_brightness = {1: 50}
+        controller.max_brightness = {1: 100}
+
+        controller.adjust_brightness(delta)
+
+        assert controller.target_brightness[1] == expected
+
+    def test_stop_worker_closes_interface(self, controller, mocker):
+        """Test that stopping the worker also releases the display devices"""
+        mock_stop = mocker.patch.object(controller.worker, "stop")
+        mock_close = mocker.patch.object(controller.ddc, "close")
+
+        controller.stop_worker()
+
+        mock_stop.assert_called_once_with()
+        mock_close.assert_called_once_with()
@@ -3,12 +3,17 @@ Unit tests for base DDC functionality using pytest
 """
 
 import subprocess
+import threading
 import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 
-from monitorsettings.base import AsyncDDCWorker, DDCInterface
+from monitorsettings.base import AsyncDDCWorker, DDCInterface, DirectDDC
+
+# ddcutil getvcp output for brightness
+_VCP_STDOUT_TMPL = "VCP code 0x10 (Brightness): current value = {current}, max value = {max_val}"
 
 
 @pytest.fixture
@@ -17,10 +22,16 @@ def ddc_interface():
     return DDCInterface()
 
 
+@pytest.fixture(autouse=True)
+def no_real_subprocess(mock_subprocess):
+    """Patch subprocess for every test so ddcutil is never actually spawned"""
+    return mock_subprocess
+
+
 @pytest.fixture
 def async_worker(ddc_interface):
-    """Fixture providing an AsyncDDCWorker instance"""
-    return AsyncDDCWorker(ddc_interface, update_interval=0.1)
+    """Fixture providing an AsyncDDCWorker instance that never sleeps on backoff"""
+    return AsyncDDCWorker(ddc_interface, sleep=lambda _: None)
 
 
 class TestDDCInterface:
@@ -28,27 +39,34 @@ class TestDDCInterface:
 
     def test_check_ddcutil_available(self, ddc_interface, mocker):
         """Test checking for ddcutil availability when present"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_which = mocker.patch("shutil.which", return_value="/usr/bin/ddcutil")
 
         result = ddc_interface.check_ddcutil()
 
         assert result is True
-        mock_run.assert_called_once()
+        mock_which.assert_called_once_with("ddcutil")
 
     def test_check_ddcutil_not_available(self, ddc_interface, mocker):
         """Test checking for ddcutil when not present"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.side_effect = subprocess.CalledProcessError(1, "which")
+        mocker.patch("shutil.which", return_value=None)
 
         result = ddc_interface.check_ddcutil()
 
         assert result is False
 
-    def test_detect_displays(self, ddc_interface, mocker):
+    def test_check_ddcutil_is_cached(self, ddc_interface, mocker):
+        """Test that the PATH lookup only happens once per process"""
+        mock_which = mocker.patch("shutil.which", return_value="/usr/bin/ddcutil")
+
+        assert ddc_interface.check_ddcutil() is True
+        assert DDCInterface().check_ddcutil() is True
+
+        mock_which.assert_called_once_with("ddcutil")
+
+    def test_detect_displays(self, ddc_interface, mock_subprocess, mock_i2c_unavailable):
         """Test display detection"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(
             stdout="Display 1\nI2C bus: /dev/i2c-1\nDisplay 2\nI2C bus: /dev/i2c-2"
         )
 
@@ -56,11 +74,29 @@ class TestDDCInterface:
 
         assert displays == [1, 2]
         assert ddc_interface.displays == [1, 2]
+        # Only the patched open was tried, so no real bus was opened
+        assert [c.args[0] for c in mock_i2c_unavailable.call_args_list] == [
+            "/dev/i2c-1",
+            "/dev/i2c-2",
+        ]
+
+    def test_detect_displays_records_buses(
+        self, ddc_interface, mock_subprocess, mock_i2c_unavailable
+    ):
+        """Test that detection records each display's I2C bus"""
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(
+            stdout="Display 1\n   I2C bus:  /dev/i2c-4\nDisplay 2\n   I2C bus:  /dev/i2c-7"
+        )
+
+        ddc_interface.detect_displays()
+
+        assert ddc_interface.buses == {1: 4, 2: 7}
 
-    def test_detect_displays_none_found(self, ddc_interface, mocker):
+    def test_detect_displays_none_found(self, ddc_interface, mock_subprocess):
         """Test display detection when no displays found"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(stdout="No displays found")
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(stdout="No displays found")
 
         displays = ddc_interface.detect_displays()
 
@@ -75,11 +111,11 @@ class TestDDCInterface:
             (75, 255),
         ],
     )
-    def test_get_vcp_value(self, ddc_interface, mocker, current, max_val):
+    def test_get_vcp_value(self, ddc_interface, mock_subprocess, current, max_val):
         """Test getting VCP value with various brightness levels"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(
-            stdout=f"VCP code 0x10 (Brightness): current value = {current}, max value = {max_val}"
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(
+            stdout=_VCP_STDOUT_TMPL.format(current=current, max_val=max_val)
         )
 
         result_current, result_max = ddc_interface.get_vcp_value(1, "0x10")
@@ -87,9 +123,19 @@ class TestDDCInterface:
         assert result_current == current
         assert result_max == max_val
 
-    def test_get_vcp_value_error(self, ddc_interface, mocker):
+    def test_get_vcp_value_ddcutil_padding(self, ddc_interface, mock_subprocess):
+        """Test parsing ddcutil's column-aligned getvcp output"""
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(
+            stdout="VCP code 0x10 (Brightness                    ): "
+            "current value =    60, max value =   100\n"
+        )
+
+        assert ddc_interface.get_vcp_value(1, "0x10") == (60, 100)
+
+    def test_get_vcp_value_error(self, ddc_interface, mock_subprocess):
         """Test getting VCP value with error"""
-        mock_run = mocker.patch("subprocess.run")
+        mock_run = mock_subprocess["run"]
         mock_run.side_effect = subprocess.TimeoutExpired("ddcutil", 2)
 
         current, max_val = ddc_interface.get_vcp_value(1, "0x10")
@@ -97,33 +143,34 @@ class TestDDCInterface:
         assert current is None
         assert max_val is None
 
-    def test_set_vcp_value(self, ddc_interface, mocker):
+    def test_set_vcp_value(self, ddc_interface, mock_subprocess):
         """Test setting VCP value"""
-        mock_run = mocker.patch("subprocess.run")
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(returncode=0)
 
         result = ddc_interface.set_vcp_value(1, "0x10", 75)
 
         assert result is True
         mock_run.assert_called_with(
-            ["ddcutil", "setvcp", "0x10", "75", "-d", "1"],
-            capture_output=True,
+            ["ddcutil", "setvcp", "0x10", "75", "--noverify", "-d", "1"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
             timeout=3,
             check=True,
         )
 
-    def test_set_vcp_value_failure(self, ddc_interface, mocker):
+    def test_set_vcp_value_failure(self, ddc_interface, mock_subprocess):
         """Test setting VCP value with failure"""
-        mock_run = mocker.patch("subprocess.run")
+        mock_run = mock_subprocess["run"]
         mock_run.side_effect = subprocess.CalledProcessError(1, "ddcutil")
 
         result = ddc_interface.set_vcp_value(1, "0x10", 75)
 
         assert result is False
 
-    def test_set_vcp_value_async(self, ddc_interface, mocker):
+    def test_set_vcp_value_async(self, ddc_interface, mock_subprocess):
         """Test async VCP value setting"""
-        mock_popen = mocker.patch("subprocess.Popen")
+        mock_popen = mock_subprocess["popen"]
         mock_process = MagicMock()
         mock_popen.return_value = mock_process
 
@@ -132,18 +179,155 @@ class TestDDCInterface:
         assert process == mock_process
         mock_popen.assert_called_once()
 
+    def test_set_vcp_values_async_single_invocation(self, ddc_interface, mock_subprocess):
+        """Test that several VCP values for one display share one ddcutil call"""
+        mock_popen = mock_subprocess["popen"]
+
+        ddc_interface.set_vcp_values_async(2, [("0x10", 80), ("0x12", 40)])
+
+        mock_popen.assert_called_once()
+        assert (
+            mock_popen.call_args.args[0] == "ddcutil setvcp 0x10 80 0x12 40 --noverify -d 2".split()
+        )
+
+    def test_known_bus_skips_display_detection(self, ddc_interface, mocker, mock_subprocess):
+        """Test that displays with a known I2C bus are addressed by bus"""
+        mock_run = mock_subprocess["run"]
+        mock_run.return_value = SimpleNamespace(stdout="")
+        mock_popen = mock_subprocess["popen"]
+        mocker.patch("time.sleep")
+        ddc_interface.buses = {2: 7}
+
+        ddc_interface.get_vcp_value(2, "0x10")
+        ddc_interface.set_vcp_values_async(2, [("0x10", 80)])
+
+        assert mock_run.call_args.args[0] == "ddcutil getvcp 0x10 --bus 7".split()
+        assert mock_popen.call_args.args[0] == "ddcutil setvcp 0x10 80 --noverify --bus 7".split()
+
     def test_command_interval_enforcement(self, ddc_interface, mocker):
         """Test that minimum time between commands is enforced"""
         mock_sleep = mocker.patch("time.sleep")
         mock_time = mocker.patch("time.time")
         mock_time.side_effect = [0, 0, 0.2, 0.2, 0.3]  # Simulate time passing
 
-        ddc_interface._wait_for_command_interval()
-        ddc_interface._wait_for_command_interval()
+        ddc_interface._wait_for_command_interval(1)
+        ddc_interface._wait_for_command_interval(1)
 
         # Should sleep to maintain interval
         mock_sleep.assert_called()
 
+    def test_command_interval_is_per_display(self, ddc_interface, mocker):
+        """Test that commands to different displays don't wait on each other"""
+        mock_sleep = mocker.patch("time.sleep")
+        mock_time = mocker.patch("time.time")
+        mock_time.side_effect = [5, 5, 5.2, 5.2]
+
+        ddc_interface._wait_for_command_interval(1)
+        ddc_interface._wait_for_command_interval(2)
+
+        mock_sleep.assert_not_called()
+
+
+class TestDirectDDC:
+    """Test cases for DirectDDC class"""
+
+    def test_build_set_vcp_packet(self):
+        """Test the Set VCP Feature message layout and checksum"""
+        packet = DirectDDC({}).build_set_vcp_packet(0x10, 50)
+
+        assert packet == bytes([0x51, 0x84, 0x03, 0x10, 0x00, 0x32, 0x9A])
+
+    def test_set_vcp_values_writes_packets(self, mocker):
+        """Test that values are written to the display's I2C device"""
+        mocker.patch("os.open", return_value=9)
+        mock_ioctl = mocker.patch("fcntl.ioctl")
+        mock_write = mocker.patch("os.write")
+
+        direct = DirectDDC({1: 4})
+        result = direct.set_vcp_values(1, [("0x10", 50)])
+
+        assert result is True
+        mock_ioctl.assert_called_once_with(9, DirectDDC.I2C_SLAVE, 0x37)
+        mock_write.assert_called_once_with(9, direct.build_set_vcp_packet(0x10, 50))
+
+    def test_unopenable_bus_is_skipped(self, mocker):
+        """Test that displays whose I2C device can't be opened are left to ddcutil"""
+        mocker.patch("os.open", side_effect=PermissionError)
+
+        direct = DirectDDC({1: 4})
+
+        assert direct.has_display(1) is False
+        assert direct.set_vcp_values(1, [("0x10", 50)]) is False
+
+    def test_set_vcp_values_spaces_packets(self, mocker):
+        """Test that consecutive packets to a display keep the DDC/CI wait"""
+        mocker.patch("os.open", return_value=9)
+        mocker.patch("fcntl.ioctl")
+        mock_write = mocker.patch("os.write")
+        mock_sleep = mocker.patch("time.sleep")
+
+        direct = DirectDDC({1: 4})
+        assert direct.set_vcp_values(1, [("0x10", 50), ("0x12", 40)]) is True
+
+        assert mock_write.call_count == 2
+        mock_sleep.assert_called_once_with(DirectDDC.SET_VCP_INTERVAL)
+
+    def test_interface_close_releases_devices(self, ddc_interface, mocker):
+        """Test that closing the interface closes the direct path's devices"""
+        mocker.patch("os.open", return_value=9)
+        mocker.patch("fcntl.ioctl")
+        mock_close = mocker.patch("os.close")
+        ddc_interface._direct = DirectDDC({1: 4})
+
+        ddc_interface.close()
+
+        mock_close.assert_called_once_with(9)
+        assert ddc_interface.set_vcp_values_direct(1, [("0x10", 50)]) is False
+
+    def test_worker_paces_direct_writes(self, ddc_interface, mocker):
+        """Test that direct writes to a display wait out the DDC/CI interval, coalesced"""
+        writes = []
+        first, second = threading.Event(), threading.Event()
+
+        def write_direct(display, values):
+            writes.append((time.monotonic(), values))
+            (second if first.is_set() else first).set()
+            return True
+
+        mocker.patch.object(ddc_interface, "set_vcp_values_direct", side_effect=write_direct)
+        worker = AsyncDDCWorker(ddc_interface)
+        worker.start()
+
+        worker.queue_update(1, "0x10", 50)
+        assert first.wait(1.0)
+        # A key-repeat burst right after the write
+        worker.queue_update(1, "0x10", 60)
+        worker.queue_update(1, "0x10", 70)
+        assert second.wait(1.0)
+        worker.stop()
+
+        assert [values for _, values in writes] == [[("0x10", 50)], [("0x10", 70)]]
+        assert writes[1][0] - writes[0][0] >= DirectDDC.SET_VCP_INTERVAL
+
+    def test_worker_wait_timeout_covers_held_direct_write(self, async_worker):
+        """Test that the worker wakes when a held direct write is due"""
+        assert async_worker._wait_timeout() is None
+
+        async_worker._direct_writes[1] = time.monotonic()
+        async_worker._pending_updates[(1, "0x10")] = 70
+
+        assert 0 < async_worker._wait_timeout() <= DirectDDC.SET_VCP_INTERVAL
+
+    def test_worker_prefers_direct_path(self, ddc_interface, mocker):
+        """Test that the worker only spawns ddcutil when the direct write fails"""
+        mocker.patch.object(ddc_interface, "set_vcp_values_direct", side_effect=lambda d, v: d == 1)
+        mock_set_async = mocker.patch.object(ddc_interface, "set_vcp_values_async")
+        worker = AsyncDDCWorker(ddc_interface)
+
+        worker._send_updates([((1, "0x10"), 50), ((2, "0x10"), 60)])
+
+        mock_set_async.assert_called_once_with(2, [("0x10", 60)])
+
 
 class TestAsyncDDCWorker:
     """Test cases for AsyncDDCWorker class"""
@@ -167,43 +351,83 @@ class TestAsyncDDCWorker:
         assert async_worker._pending_updates[(2, "0x10")] == 75
         assert async_worker._pending_updates[(1, "0x12")] == 100
 
+    def test_queue_update_batch(self, async_worker, mocker):
+        """Test queuing several updates with a single wake"""
+        mock_wake = mocker.patch.object(async_worker, "_wake")
+
+        async_worker.queue_update_batch({(1, "0x10"): 50, (2, "0x10"): 75})
+
+        assert async_worker._pending_updates == {(1, "0x10"): 50, (2, "0x10"): 75}
+        mock_wake.set.assert_called_once_with()
+
     def test_worker_processes_updates(self, async_worker, mocker):
         """Test that worker processes queued updates"""
-        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_value_async")
+        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_values_async")
         mock_process = MagicMock()
-        mock_set_async.return_value = mock_process
+        done = threading.Event()
+
+        def set_async(display, values):
+            if mock_set_async.call_count >= 2:
+                done.set()
+            return mock_process
 
-        # Queue some updates
+        mock_set_async.side_effect = set_async
+
+        # Queue some updates, two codes on display 1 share one invocation
         async_worker.queue_update(1, "0x10", 75)
+        async_worker.queue_update(1, "0x12", 40)
         async_worker.queue_update(2, "0x10", 80)
 
         # Start worker
         async_worker.start()
 
         # Wait for processing
-        time.sleep(0.2)
+        assert done.wait(1.0)
 
         # Stop worker
         async_worker.stop()
 
-        # Check that updates were sent
+        # Check that updates were sent, one call per display
         assert mock_set_async.call_count == 2
+        mock_set_async.assert_any_call(1, [("0x10", 75), ("0x12", 40)])
+        mock_set_async.assert_any_call(2, [("0x10", 80)])
 
-    def test_worker_start_stop(self, async_worker):
+    def test_worker_start_stop(self, async_worker, mocker):
         """Test starting and stopping worker thread"""
+        mock_thread_cls = mocker.patch("monitorsettings.base.threading.Thread")
+        mock_thread = mock_thread_cls.return_value
         assert async_worker.running is False
 
         async_worker.start()
         assert async_worker.running is True
-        assert async_worker._thread is not None
-        assert async_worker._thread.is_alive()
+        mock_thread_cls.assert_called_once_with(target=async_worker._worker_loop, daemon=True)
+        mock_thread.start.assert_called_once_with()
+
+        # Starting again while running doesn't create a second thread
+        async_worker.start()
+        mock_thread_cls.assert_called_once()
 
         async_worker.stop(timeout=0.5)
         assert async_worker.running is False
+        assert async_worker._wake.is_set()
+        mock_thread.join.assert_called_once_with(timeout=0.5)
+
+    def test_worker_stop_terminates_hung_ddcutil(self, async_worker):
+        """Test that stop waits for in-flight ddcutil and terminates it if hung"""
+        finished = MagicMock()
+        hung = MagicMock()
+        hung.wait.side_effect = [subprocess.TimeoutExpired("ddcutil", 0.5), 0]
+        async_worker._inflight = {1: finished, 2: hung}
+
+        async_worker.stop()
+
+        finished.terminate.assert_not_called()
+        hung.terminate.assert_called_once_with()
+        assert async_worker._inflight == {}
 
     def test_worker_deduplication(self, async_worker, mocker):
         """Test that worker doesn't re-send same values"""
-        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_value_async")
+        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_values_async")
 
         # Set initial state
         async_worker._last_sent[(1, "0x10")] = 50
@@ -212,7 +436,125 @@ class TestAsyncDDCWorker:
         async_worker.queue_update(1, "0x10", 50)
 
         # Process updates (should not send anything)
-        with async_worker._lock:
-            async_worker._pending_updates.clear()
+        async_worker._pending_updates.clear()
 
         assert mock_set_async.call_count == 0
+
+    def test_queue_update_wakes_worker(self, async_worker):
+        """Test that queuing an update signals the worker instead of being polled"""
+        assert not async_worker._wake.is_set()
+
+        async_worker.queue_update(1, "0x10", 50)
+
+        assert async_worker._wake.is_set()
+
+    def test_send_updates_requeues_on_spawn_failure(self, async_worker, mocker):
+        """Test that updates whose ddcutil spawn failed are queued for retry"""
+        mocker.patch.object(async_worker.ddc, "set_vcp_values_async", side_effect=OSError)
+        async_worker._last_sent[(1, "0x10")] = 75
+
+        result = async_worker._send_updates([((1, "0x10"), 75)])
+
+        assert result is False
+        assert async_worker._pending_updates[(1, "0x10")] == 75
+        assert (1, "0x10") not in async_worker._last_sent
+        assert async_worker._wake.is_set()
+
+    def test_worker_backs_off_after_spawn_failure(self, ddc_interface, mocker):
+        """Test that the worker waits before retrying a failed spawn"""
+        retried = threading.Event()
+
+        def set_async(display, values):
+            if mock_set_async.call_count == 1:
+                raise OSError
+            retried.set()
+            return MagicMock()
+
+        mock_set_async = mocker.patch.object(
+            ddc_interface, "set_vcp_values_async", side_effect=set_async
+        )
+        mock_sleep = MagicMock()
+        worker = AsyncDDCWorker(ddc_interface, sleep=mock_sleep)
+
+        worker.start()
+        worker.queue_update(1, "0x10", 75)
+        assert retried.wait(1.0)
+        worker.stop()
+
+        assert mock_set_async.call_count == 2
+        mock_sleep.assert_called_once()
+        assert 0.05 <= mock_sleep.call_args.args[0] <= 1.0
+
+    def test_worker_keeps_update_queued_during_batch(self, async_worker, mocker):
+        """Test that an update queued while a batch is sent is not lost"""
+        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_values_async")
+        done = threading.Event()
+
+        def queue_newer(display, values):
+            # Simulate the UI thread queuing while the worker is sending
+            if mock_set_async.call_count == 1:
+                async_worker.queue_update(1, "0x10", 90)
+            else:
+                done.set()
+            return MagicMock()
+
+        mock_set_async.side_effect = queue_newer
+        async_worker.queue_update(1, "0x10", 75)
+
+        async_worker.start()
+        assert done.wait(1.0)
+        async_worker.stop()
+
+        assert mock_set_async.call_args_list[0].args == (1, [("0x10", 75)])
+        assert mock_set_async.call_args_list[1].args == (1, [("0x10", 90)])
+
+    def test_worker_sends_without_debounce(self, async_worker, mocker):
+        """Test that a queued update is sent on the very next loop pass"""
+        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_values_async")
+
+        async_worker.queue_update(1, "0x10", 75)
+
+        # The loop is woken at once, with no debounce timer to wait out
+        assert async_worker._wake.is_set()
+        assert async_worker._wait_timeout() is None
+
+        async_worker._process_pending()
+
+        mock_set_async.assert_called_once_with(1, [("0x10", 75)])
+
+    def test_worker_coalesces_while_inflight(self, async_worker, mocker):
+        """Test that updates for a busy display wait and only the latest is sent"""
+        mock_set_async = mocker.patch.object(async_worker.ddc, "set_vcp_values_async")
+        running = MagicMock()
+        running.poll.return_value = None
+        async_worker._inflight[1] = running
+
+        async_worker.queue_update(1, "0x10", 60)
+        async_worker.queue_update(1, "0x10", 70)
+        async_worker._process_pending()
+
+        # Held back while the previous command is still running
+        mock_set_async.assert_not_called()
+        assert async_worker._pending_updates == {(1, "0x10"): 70}
+        assert async_worker._wait_timeout() == async_worker.poll_interval
+
+        running.poll.return_value = 0
+        async_worker._process_pending()
+
+        mock_set_async.assert_called_once_with(1, [("0x10", 70)])
+        assert async_worker._pending_updates == {}
+
+    def test_worker_notifies_on_change(self, ddc_interface, mocker):
+        """Test that the worker reports sent updates to its owner"""
+        mocker.patch.object(ddc_interface, "set_vcp_values_async")
+        notified = threading.Event()
+        changed = MagicMock(side_effect=notified.set)
+        worker = AsyncDDCWorker(ddc_interface, on_change=changed)
+
+        worker.start()
+        worker.queue_update(1, "0x10", 75)
+        assert notified.wait(1.0)
+        worker.stop()
+
+        changed.assert_called_once_with()
+        assert worker._last_sent[(1, "0x10")] == 75
@@ -2,13 +2,42 @@
 Unit tests for blessed backlight controller using pytest
 """
 
+import os
+import time
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
+from blessed.keyboard import Keystroke
 
 from monitorsettings.controllers.backlight.blessed import BlessedBacklightController
 
 
+class FakeStyle(str):
+    """Stand-in for blessed's FormattingString: the escape itself, callable to wrap text"""
+
+    def __call__(self, text):
+        return f"{self}{text}<n>"
+
+
+def make_keystroke(char):
+    """Build a blessed Keystroke for a plain character, as inkey returns it"""
+    return Keystroke(char)
+
+
+# Named keys as inkey returns them; Keystroke is an immutable str, so tests can share them
+KEYS = {
+    name: Keystroke(sequence, name=name)
+    for name, sequence in [
+        ("KEY_UP", "\x1b[A"),
+        ("KEY_DOWN", "\x1b[B"),
+        ("KEY_RIGHT", "\x1b[C"),
+        ("KEY_LEFT", "\x1b[D"),
+        ("KEY_ESCAPE", "\x1b"),
+    ]
+}
+
+
 @pytest.fixture
 def mock_terminal(mocker):
     """Mock blessed Terminal"""
@@ -17,6 +46,13 @@ def mock_terminal(mocker):
     mock_term.cbreak.return_value.__exit__ = MagicMock(return_value=None)
     mock_term.hidden_cursor.return_value.__enter__ = MagicMock(return_value=None)
     mock_term.hidden_cursor.return_value.__exit__ = MagicMock(return_value=None)
+    # Frames are joined into one string, so escapes and colors must produce text
+    mock_term.move_up.side_effect = lambda n: f"<up {n}>"
+    mock_term.clear_eol = "<eol>"
+    mock_term.normal = "<n>"
+    mock_term.move_yx.side_effect = lambda y, x: f"<yx {y},{x}>"
+    mock_term.get_location.return_value = (-1, -1)  # Terminal did not answer
+    mock_term.color_rgb.side_effect = lambda r, g, b: FakeStyle(f"<{r},{g},{b}>")
     mocker.patch("monitorsettings.controllers.backlight.blessed.Terminal", return_value=mock_term)
     return mock_term
 
@@ -27,6 +63,30 @@ def controller(mock_terminal):
     return BlessedBacklightController()
 
 
+@pytest.fixture
+def draw_controller(controller):
+    """Controller with two displays and their last values sent, ready to draw"""
+    controller.displays = [1, 2]
+    controller.target_brightness = {1: 50, 2: 75}
+    controller.max_brightness = {1: 100, 2: 100}
+    controller.last_sent_brightness = {1: 50, 2: 75}
+    controller.worker = SimpleNamespace(_last_sent={})
+    return controller
+
+
+@pytest.fixture
+def run_controller(controller, mocker):
+    """Controller whose run() skips detection, the worker, the wake pipe and cleanup"""
+    mocker.patch.object(controller, "initialize", return_value=True)
+    mocker.patch.object(controller, "start_worker")
+    mocker.patch.object(controller, "_open_wake_pipe")
+    mocker.patch.object(controller, "cleanup")
+    mocker.patch("builtins.print")
+    mocker.patch("time.sleep")
+    controller.term.inkey.return_value = ""  # No key buffered
+    return controller
+
+
 class TestBlessedBacklightController:
     """Test cases for BlessedBacklightController"""
 
@@ -46,187 +106,279 @@ class TestBlessedBacklightController:
 
         controller.run()
 
-        # Should print error message
-        mock_print.assert_called()
-        # Check that error message was printed
-        error_printed = False
-        for call in mock_print.call_args_list:
-            if call.args and (
-                "No DDC/CI capable displays detected" in str(call.args[0])
-                or "RED:Error" in str(call.args[0])
-            ):
-                error_printed = True
-                break
-        assert error_printed
+        # Should print the error message
+        mock_print.assert_any_call("RED:Error: No DDC/CI capable displays detected")
 
     def test_handle_key_quit(self, controller):
         """Test quit key handling"""
         controller.running = True
 
         # Test 'q' key
-        mock_key = MagicMock()
-        mock_key.__str__ = lambda x: "q"
-        mock_key.__eq__ = lambda x, y: y == "q"
-        mock_key.name = None
-
-        controller.handle_key(mock_key)
+        controller.handle_key(make_keystroke("q"))
         assert controller.running is False
 
     def test_handle_key_escape(self, controller):
         """Test escape key handling"""
         controller.running = True
 
-        mock_key = MagicMock()
-        mock_key.name = "KEY_ESCAPE"
-
-        controller.handle_key(mock_key)
+        controller.handle_key(KEYS["KEY_ESCAPE"])
         assert controller.running is False
 
     @pytest.mark.parametrize(
-        "key_name,expected_delta",
+        "key_name,attr,expected",
         [
-            ("KEY_RIGHT", 5),
-            ("KEY_LEFT", -5),
+            ("KEY_RIGHT", "adjust_brightness", 5),
+            ("KEY_LEFT", "adjust_brightness", -5),
+            ("KEY_UP", "increment", 6),
+            ("KEY_DOWN", "increment", 4),
         ],
     )
-    def test_handle_key_brightness_adjustment(self, controller, mocker, key_name, expected_delta):
-        """Test brightness adjustment keys"""
+    def test_handle_key_arrows(self, controller, mocker, key_name, attr, expected):
+        """Test brightness adjustment and step size arrow keys"""
         controller.increment = 5
         mock_adjust = mocker.patch.object(controller, "adjust_brightness")
 
-        mock_key = MagicMock()
-        mock_key.name = key_name
-
-        controller.handle_key(mock_key)
-        mock_adjust.assert_called_once_with(expected_delta)
-
-    def test_handle_key_step_increase(self, controller):
-        """Test step size increase"""
-        controller.increment = 5
+        controller.handle_key(KEYS[key_name])
+        if attr == "adjust_brightness":
+            mock_adjust.assert_called_once_with(expected)
+        else:
+            mock_adjust.assert_not_called()
+            assert controller.increment == expected
 
-        mock_key = MagicMock()
-        mock_key.name = "KEY_UP"
+    def test_run_drains_key_burst(self, run_controller, mocker):
+        """Test that queued keys are all handled before the next redraw"""
+        mock_draw = mocker.patch.object(run_controller, "draw_interface")
 
-        controller.handle_key(mock_key)
-        assert controller.increment == 6
+        def handle(key):
+            if key == "q":
+                run_controller.running = False
 
-    def test_handle_key_step_decrease(self, controller):
-        """Test step size decrease"""
-        controller.increment = 5
+        mock_handle = mocker.patch.object(run_controller, "handle_key", side_effect=handle)
+        mock_wait = mocker.patch.object(run_controller, "_wait_for_input", return_value=True)
+        run_controller.term.inkey.side_effect = ["", "a", "b", "c", "", "", "q"]
 
-        mock_key = MagicMock()
-        mock_key.name = "KEY_DOWN"
+        run_controller.run()
 
-        controller.handle_key(mock_key)
-        assert controller.increment == 4
+        assert [c.args[0] for c in mock_handle.call_args_list] == ["a", "b", "c", "q"]
+        # The burst is drained without blocking and costs a single redraw
+        assert mock_wait.call_count == 2
+        assert all(c.kwargs["timeout"] == 0 for c in run_controller.term.inkey.call_args_list)
+        assert mock_draw.call_count == 2
 
     def test_handle_key_step_limits(self, controller):
         """Test step size limits"""
         # Test upper limit
         controller.increment = 25
-        mock_key = MagicMock()
-        mock_key.name = "KEY_UP"
-        controller.handle_key(mock_key)
+        controller.handle_key(KEYS["KEY_UP"])
         assert controller.increment == 25  # Should stay at max
 
         # Test lower limit
         controller.increment = 1
-        mock_key.name = "KEY_DOWN"
-        controller.handle_key(mock_key)
+        controller.handle_key(KEYS["KEY_DOWN"])
         assert controller.increment == 1  # Should stay at min
 
-    def test_handle_key_display_selection_all(self, controller, mocker):
-        """Test selecting all displays with '0' key"""
-        mock_select = mocker.patch.object(controller, "select_display")
-
-        mock_key = MagicMock()
-        mock_key.__str__ = lambda x: "0"
-        mock_key.__eq__ = lambda x, y: y == "0"
-        mock_key.isdigit = lambda: True
-        mock_key.name = None
-
-        controller.handle_key(mock_key)
-        mock_select.assert_called_once_with(None)
-
-    @pytest.mark.parametrize(
-        "key_char,display_num",
-        [
-            ("1", 1),
-            ("2", 2),
-            ("9", 9),
-        ],
-    )
-    def test_handle_key_display_selection_specific(self, controller, mocker, key_char, display_num):
-        """Test selecting specific display with number keys"""
-        mock_select = mocker.patch.object(controller, "select_display")
-
-        # Create a string-like mock that behaves properly for comparisons
-        class MockKey:
-            def __init__(self, char):
-                self.char = char
-                self.name = None
+    @pytest.mark.parametrize("key_char,display_num", [("0", None), ("1", 1), ("2", 2), ("9", 9)])
+    def test_handle_key_display_selection(self, controller, key_char, display_num):
+        """Test that '0' selects all displays and 1-9 select a specific one"""
+        calls = []
+        controller.select_display = calls.append
 
-            def __str__(self):
-                return self.char
+        controller.handle_key(make_keystroke(key_char))
 
-            def __eq__(self, other):
-                return str(self) == str(other)
+        assert calls == [display_num]
 
-            def __le__(self, other):
-                return str(self) <= str(other)
-
-            def __ge__(self, other):
-                return str(self) >= str(other)
-
-            def __int__(self):
-                return int(self.char)
-
-            def isdigit(self):
-                return True
-
-        mock_key = MockKey(key_char)
-        controller.handle_key(mock_key)
-        mock_select.assert_called_once_with(display_num)
-
-    def test_cleanup(self, controller, mocker):
+    def test_cleanup(self, controller, capsys):
         """Test cleanup on exit"""
-        mock_stop = mocker.patch.object(controller, "stop_worker")
-        mock_print = mocker.patch("builtins.print")
+        stopped = []
+        controller.stop_worker = lambda: stopped.append(True)
         controller.interface_lines = 5
 
         controller.cleanup()
 
-        mock_stop.assert_called_once()
-        # Should print cleanup message
-        assert mock_print.called
-
-    def test_draw_interface_color_setup(self, controller, mock_terminal, mocker):
-        """Test that draw_interface sets up colors correctly"""
-        controller.displays = [1]
-        controller.target_brightness = {1: 50}
-        controller.max_brightness = {1: 100}
-        controller.last_sent_brightness = {1: 50}
-        controller.selected_displays = []
-        controller.worker = MagicMock()
-        controller.worker._last_sent = {}
+        assert stopped == [True]
+        # Should blank the interface area and print cleanup message
+        out = capsys.readouterr().out
+        assert out.startswith("<up 5>" + "<eol>\n" * 5 + "<up 5>")
+        assert "Brightness controller exited." in out
 
-        mocker.patch("builtins.print")
-        controller.draw_interface()
+    def test_draw_interface_uses_palette_colors(self, draw_controller, capsys):
+        """Test that the drawn frame is styled with the palette's colors"""
+        draw_controller.draw_interface()
 
-        # Check that color methods were called
-        assert mock_terminal.color_rgb.called
-        assert mock_terminal.clear_eol
+        out = capsys.readouterr().out
+        # deep_wine rules, maroon/cream title, rose_gold bar, warm_gray separator
+        for rgb in ["<88,44,55>", "<139,69,89>", "<242,234,220>", "<183,110,121>", "<120,113,108>"]:
+            assert rgb in out
 
-    def test_draw_interface_updates_line_count(self, controller, mocker):
+    def test_draw_interface_updates_line_count(self, draw_controller, capsys):
         """Test that draw_interface updates the line count"""
-        controller.displays = [1, 2]
-        controller.target_brightness = {1: 50, 2: 75}
-        controller.max_brightness = {1: 100, 2: 100}
-        controller.last_sent_brightness = {1: 50, 2: 75}
-        controller.worker = MagicMock()
-        controller.worker._last_sent = {}
-
-        mocker.patch("builtins.print")
-        controller.draw_interface()
-
-        assert controller.interface_lines > 0
+        draw_controller.draw_interface()
+
+        assert draw_controller.interface_lines > 0
+
+    def test_draw_interface_skips_unchanged_lines(self, draw_controller, capsys):
+        """Test that a new frame only rewrites the lines that changed"""
+        draw_controller.draw_interface()
+        capsys.readouterr()
+        draw_controller.selected_displays = [2]
+        draw_controller.draw_interface()
+
+        # Mode line and display 1's indicator changed, the rest are bare newlines
+        out = capsys.readouterr().out
+        assert out.count("<eol>") == 2
+        assert "Mode: Display 2" in out
+        assert out.count("\n") == draw_controller.interface_lines
+
+    def test_draw_interface_skips_identical_frame(self, draw_controller, mocker):
+        """Test that nothing is written when no state changed since the last frame"""
+        mock_stdout = mocker.patch("sys.stdout")
+        draw_controller.draw_interface()
+        draw_controller.draw_interface()
+        mock_stdout.write.assert_called_once()
+
+        draw_controller.target_brightness[1] = 55
+        draw_controller.draw_interface()
+        assert mock_stdout.write.call_count == 2
+
+    def test_draw_interface_single_write(self, draw_controller, mocker):
+        """Test that a frame is emitted with a single write and flush"""
+        mock_stdout = mocker.patch("sys.stdout")
+        draw_controller.draw_interface()
+
+        mock_stdout.write.assert_called_once()
+        mock_stdout.flush.assert_called_once()
+
+    def test_draw_interface_collapses_color_runs(self, draw_controller, capsys):
+        """Test that each line resets styling once instead of after every run"""
+        draw_controller.draw_interface()
+
+        lines = capsys.readouterr().out.split("\n")
+        footer = lines[draw_controller.interface_lines - 1]
+        assert footer.count("<n>") == 1
+        assert footer.endswith("] Quit<n><eol>")
+
+    def test_draw_interface_uses_cached_palette(self, draw_controller, mock_terminal, capsys):
+        """Test that colors are built once in __init__, not on every frame"""
+        mock_terminal.color_rgb.reset_mock()
+
+        draw_controller.draw_interface()
+
+        mock_terminal.color_rgb.assert_not_called()
+        assert draw_controller._footer in capsys.readouterr().out
+
+    def test_draw_interface_rewinds_to_measured_row(self, draw_controller, mock_terminal, capsys):
+        """Test that later frames jump to the start row measured after the first frame"""
+        mock_terminal.get_location.return_value = (30, 0)
+
+        draw_controller.draw_interface()
+        capsys.readouterr()
+        draw_controller.target_brightness[1] = 55
+        draw_controller.draw_interface()
+
+        start_row = 30 - draw_controller.interface_lines
+        out = capsys.readouterr().out
+        assert out.startswith(f"<yx {start_row},0>")
+        assert "<up" not in out
+        mock_terminal.get_location.assert_called_once()
+
+    def test_draw_interface_caches_bar_lines(self, draw_controller, capsys):
+        """Test that unchanged displays reuse their cached bar line"""
+        draw_controller.draw_interface()
+        draw_controller.target_brightness[2] = 80
+        draw_controller.last_sent_brightness[2] = 80
+        draw_controller.draw_interface()
+
+        # Display 1 was rendered once and reused, display 2 rendered twice
+        info = draw_controller._bar_line.cache_info()
+        assert info.hits == 1
+        assert info.misses == 3
+
+    def test_run_redraws_only_when_dirty(self, run_controller, mocker):
+        """Test that the loop idles without redrawing until something changes"""
+        mock_draw = mocker.patch.object(run_controller, "draw_interface")
+
+        def wait(timeout):
+            # Two idle timeouts, then the worker reports a sent update, then quit
+            calls = mock_wait.call_count
+            if calls == 3:
+                run_controller.worker.on_change()
+            if calls == 4:
+                run_controller.running = False
+            return False
+
+        mock_wait = mocker.patch.object(run_controller, "_wait_for_input", side_effect=wait)
+
+        run_controller.run()
+
+        # Initial frame plus the one after the worker's change
+        assert mock_draw.call_count == 2
+        # Only blessed's own buffer is checked, never blocking on it
+        assert all(c.kwargs["timeout"] == 0 for c in run_controller.term.inkey.call_args_list)
+
+    def test_run_handles_buffered_key_without_waiting(self, run_controller, mocker):
+        """Test that a key blessed already buffered is handled without select"""
+        mocker.patch.object(run_controller, "draw_interface")
+        mock_wait = mocker.patch.object(run_controller, "_wait_for_input", return_value=False)
+        run_controller.term.inkey.side_effect = [make_keystroke("q")]
+
+        run_controller.run()
+
+        assert run_controller.running is False
+        mock_wait.assert_not_called()
+
+    def test_run_clears_pending_marker_after_worker_change(self, run_controller, mocker):
+        """Test that the frame drawn for the worker's change no longer shows '*'"""
+        mock_stdout = mocker.patch("sys.stdout")
+        run_controller.displays = [1]
+        run_controller.current_brightness = {1: 50}
+        run_controller.max_brightness = {1: 100}
+        run_controller.target_brightness = {1: 50}
+        run_controller.worker._last_sent[(1, "0x10")] = 50
+
+        def wait(timeout):
+            calls = mock_wait.call_count
+            if calls == 1:
+                # A key press raises the target
+                run_controller.adjust_brightness(5)
+            elif calls == 2:
+                # The worker sends the queued value and reports it
+                sent = run_controller.worker._pending_updates.pop((1, "0x10"))
+                run_controller.worker._last_sent[(1, "0x10")] = sent
+                run_controller.worker.on_change()
+            else:
+                run_controller.running = False
+            return False
+
+        mock_wait = mocker.patch.object(run_controller, "_wait_for_input", side_effect=wait)
+
+        run_controller.run()
+
+        frames = [c.args[0] for c in mock_stdout.write.call_args_list]
+        assert len(frames) == 3
+        assert " 55%" in frames[1] and "*" in frames[1]
+        assert " 55%" in frames[2] and "*" not in frames[2]
+        assert not run_controller._dirty.is_set()
+
+    def test_worker_change_wakes_input_wait(self, controller, mocker):
+        """Test that a worker change ends the input wait without a key"""
+        stdin_r, stdin_w = os.pipe()
+        mocker.patch("sys.stdin", MagicMock(fileno=lambda: stdin_r))
+        controller._open_wake_pipe()
+
+        try:
+            controller._on_worker_change()
+            start = time.time()
+            has_key = controller._wait_for_input(5.0)
+            elapsed = time.time() - start
+
+            assert has_key is False
+            assert elapsed < 1.0
+            assert controller._dirty.is_set()
+
+            # The wake-up was consumed, so the next wait sees the key instead
+            os.write(stdin_w, b"q")
+            assert controller._wait_for_input(5.0) is True
+        finally:
+            controller._close_wake_pipe()
+            os.close(stdin_r)
+            os.close(stdin_w)
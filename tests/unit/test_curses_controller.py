@@ -3,12 +3,17 @@ Unit tests for curses backlight controller using pytest
 """
 
 import curses
-from unittest.mock import MagicMock
+import signal
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
 from monitorsettings.controllers.backlight.curses import CursesBacklightController
 
+KEY_ESC = 27  # getch has no curses constant for a bare ESC
+TERM_SIZE = (24, 80)  # Standard terminal size, as (height, width)
+
 
 @pytest.fixture
 def controller():
@@ -19,11 +24,28 @@ def controller():
 @pytest.fixture
 def mock_stdscr():
     """Mock curses window object"""
-    stdscr = MagicMock()
-    stdscr.getmaxyx.return_value = (24, 80)  # Standard terminal size
+    stdscr = Mock()
+    stdscr.getmaxyx.return_value = TERM_SIZE
     return stdscr
 
 
+@pytest.fixture
+def draw_controller(controller, mock_stdscr):
+    """Controller with two displays and their last values sent, ready to draw"""
+    controller.stdscr = mock_stdscr
+    controller.displays = [1, 2]
+    controller.target_brightness = {1: 50, 2: 75}
+    controller.max_brightness = {1: 100, 2: 100}
+    controller.last_sent_brightness = {1: 50, 2: 75}
+    return controller
+
+
+@pytest.fixture(autouse=True)
+def mock_doupdate(mocker):
+    """Mock curses.doupdate, which needs a real screen"""
+    return mocker.patch("curses.doupdate")
+
+
 class TestCursesBacklightController:
     """Test cases for CursesBacklightController"""
 
@@ -33,29 +55,51 @@ class TestCursesBacklightController:
         assert controller.last_sent_brightness == {}
         assert controller.running is True
 
-    def test_run_calls_wrapper(self, controller, mocker):
+    def test_run_calls_wrapper(self, controller):
         """Test that run method uses curses wrapper"""
-        mock_wrapper = mocker.patch("curses.wrapper")
+        calls = []
+        controller._wrapper = calls.append
 
         controller.run()
 
-        mock_wrapper.assert_called_once()
+        assert calls == [controller._run_curses]
 
-    def test_handle_key_quit_q(self, controller):
-        """Test quit with 'q' key"""
+    def test_wrapper_defaults_to_curses(self, controller):
+        """Test that the real curses wrapper is used unless replaced"""
+        assert controller._wrapper is curses.wrapper
+
+    @pytest.mark.parametrize("key", [ord("q"), ord("Q"), KEY_ESC], ids=["q", "Q", "esc"])
+    def test_handle_key_quit(self, controller, key):
+        """Test quit with 'q', 'Q' and ESC"""
         controller.running = True
 
-        controller.handle_key(ord("q"))
+        controller.handle_key(key)
 
         assert controller.running is False
 
-    def test_handle_key_quit_escape(self, controller):
-        """Test quit with ESC key"""
-        controller.running = True
+    def test_sigint_stops_loop_and_cleans_up(self, controller, mocker, mock_stdscr):
+        """Test that Ctrl-C ends the main loop and still runs cleanup"""
+        mocker.patch("curses.curs_set")
+        mocker.patch.object(controller, "_init_displays", return_value=True)
+        mocker.patch.object(controller, "start_worker")
+        mocker.patch.object(controller, "draw_interface")
+        mock_cleanup = mocker.patch.object(controller, "cleanup")
+        mock_signal = mocker.patch("signal.signal", return_value="previous")
+
+        def getch():
+            # Simulate SIGINT arriving while waiting for input
+            handler = mock_signal.call_args_list[0].args[1]
+            handler(signal.SIGINT, None)
+            return -1
 
-        controller.handle_key(27)  # ESC
+        mock_stdscr.getch.side_effect = getch
+
+        controller._run_curses(mock_stdscr)
 
         assert controller.running is False
+        mock_cleanup.assert_called_once()
+        # The previous handler is restored on the way out
+        assert mock_signal.call_args_list[-1].args == (signal.SIGINT, "previous")
 
     @pytest.mark.parametrize(
         "key,expected_delta",
@@ -65,69 +109,73 @@ class TestCursesBacklightController:
             (curses.KEY_DOWN, -10),
             (curses.KEY_LEFT, -10),
         ],
+        ids=["up", "right", "down", "left"],
     )
-    def test_handle_key_brightness_adjustment(self, controller, mocker, key, expected_delta):
+    def test_handle_key_brightness_adjustment(self, controller, key, expected_delta):
         """Test brightness adjustment with arrow keys"""
         controller.increment = 10
-        mock_adjust = mocker.patch.object(controller, "adjust_brightness")
+        calls = []
+        controller.adjust_brightness = calls.append
 
         controller.handle_key(key)
 
-        mock_adjust.assert_called_once_with(expected_delta)
+        assert calls == [expected_delta]
 
-    @pytest.mark.parametrize(
-        "key,expected_change",
-        [
-            (ord("+"), 1),
-            (ord("="), 1),
-            (ord("-"), -1),
-            (ord("_"), -1),
-        ],
-    )
-    def test_handle_key_step_adjustment(self, controller, key, expected_change):
+    def test_handle_key_step_adjustment(self, controller):
         """Test step size adjustment"""
-        controller.increment = 5
+        for key, expected_change in [(ord("+"), 1), (ord("="), 1), (ord("-"), -1), (ord("_"), -1)]:
+            controller.increment = 5
 
-        controller.handle_key(key)
-
-        assert controller.increment == 5 + expected_change
+            controller.handle_key(key)
 
-    def test_handle_key_step_limits(self, controller):
-        """Test step size limits"""
-        # Test upper limit
-        controller.increment = 25
-        controller.handle_key(ord("+"))
-        assert controller.increment == 25  # Should stay at max
+            assert controller.increment == 5 + expected_change, chr(key)
 
-        # Test lower limit
-        controller.increment = 1
-        controller.handle_key(ord("-"))
-        assert controller.increment == 1  # Should stay at min
+    @pytest.mark.parametrize("key,limit", [(ord("+"), 25), (ord("-"), 1)], ids=["max", "min"])
+    def test_handle_key_step_limits(self, controller, key, limit):
+        """Test that the step size stays within its limits"""
+        controller.increment = limit
 
-    def test_handle_key_display_selection_all(self, controller, mocker):
-        """Test selecting all displays with '0' key"""
-        mock_select = mocker.patch.object(controller, "select_display")
-
-        controller.handle_key(ord("0"))
+        controller.handle_key(key)
 
-        mock_select.assert_called_once_with(None)
+        assert controller.increment == limit
 
     @pytest.mark.parametrize(
-        "key_char,display_num",
-        [
-            ("1", 1),
-            ("2", 2),
-            ("5", 5),
-            ("9", 9),
-        ],
+        "key_char,display_num", [("0", None), ("1", 1), ("2", 2), ("5", 5), ("9", 9)]
     )
-    def test_handle_key_display_selection_specific(self, controller, mocker, key_char, display_num):
-        """Test selecting specific display with number keys"""
-        mock_select = mocker.patch.object(controller, "select_display")
+    def test_handle_key_display_selection(self, controller, key_char, display_num):
+        """Test that '0' selects all displays and 1-9 select a specific one"""
+        calls = []
+        controller.select_display = calls.append
 
         controller.handle_key(ord(key_char))
 
-        mock_select.assert_called_once_with(display_num)
+        assert calls == [display_num]
+
+    def test_key_dispatch_targets_exist(self):
+        """Test that every key in the dispatch table maps to a controller method"""
+        for key, (method, _arg) in CursesBacklightController._KEY_DISPATCH.items():
+            assert callable(getattr(CursesBacklightController, method, None)), key
+
+    def test_handle_key_ignores_unmapped_keys(self, controller):
+        """Test that keys outside the dispatch table change nothing"""
+        controller.handle_key(ord("x"))
+        controller.handle_key(-1)
+
+        assert controller.running is True
+        assert controller.increment == 5
+        assert controller.selected_displays == []
+
+    def test_input_timeout(self, controller):
+        """Test that the loop only blocks briefly while work is outstanding"""
+        controller._dirty.clear()
+        assert controller._input_timeout() == controller.IDLE_TIMEOUT
+
+        controller.worker.queue_update(1, "0x10", 60)
+        assert controller._input_timeout() == controller.BUSY_TIMEOUT
+
+        controller.worker._pending_updates.clear()
+        controller.select_display(None)
+        assert controller._input_timeout() == controller.BUSY_TIMEOUT
 
     def test_init_displays_failure(self, controller, mocker, mock_stdscr):
         """Test display initialization failure handling"""
@@ -144,6 +192,7 @@ class TestCursesBacklightController:
         """Test successful display initialization"""
         controller.stdscr = mock_stdscr
         mocker.patch.object(controller, "initialize", return_value=True)
+        mock_sleep = mocker.patch("time.sleep")  # Pause that lets the user read the summary
         controller.displays = [1, 2]
         controller.current_brightness = {1: 50, 2: 60}
         controller.max_brightness = {1: 100, 2: 100}
@@ -153,59 +202,101 @@ class TestCursesBacklightController:
         assert result is True
         # Should show found displays
         mock_stdscr.addstr.assert_any_call(1, 0, "Found 2 display(s)")
+        mock_sleep.assert_called_once_with(0.5)
 
-    def test_draw_interface(self, controller, mock_stdscr):
+    def test_draw_interface(self, draw_controller, mock_stdscr, mock_doupdate):
         """Test interface drawing"""
-        controller.stdscr = mock_stdscr
-        controller.displays = [1, 2]
-        controller.target_brightness = {1: 50, 2: 75}
-        controller.max_brightness = {1: 100, 2: 100}
-        controller.last_sent_brightness = {1: 50, 2: 75}
-        controller.selected_displays = []
-        controller.increment = 5
-
-        controller.draw_interface()
+        draw_controller.draw_interface()
 
-        # Should clear screen and add content
+        # Should clear screen, add content and flush it in one update
         mock_stdscr.erase.assert_called_once()
-        mock_stdscr.refresh.assert_called_once()
+        mock_stdscr.noutrefresh.assert_called_once()
+        mock_doupdate.assert_called_once()
         assert mock_stdscr.addstr.called
 
-    def test_draw_interface_with_selection(self, controller, mock_stdscr):
+    def test_draw_interface_with_selection(self, draw_controller):
         """Test interface drawing with display selection"""
-        controller.stdscr = mock_stdscr
-        controller.displays = [1, 2]
-        controller.target_brightness = {1: 50, 2: 75}
-        controller.max_brightness = {1: 100, 2: 100}
-        controller.last_sent_brightness = {1: 50, 2: 75}
-        controller.selected_displays = [1]  # Only display 1 selected
+        draw_controller.selected_displays = [1]  # Only display 1 selected
 
-        controller.draw_interface()
+        lines = draw_controller._compute_paint(TERM_SIZE[1])
 
         # Should show selection mode
-        calls = [str(call) for call in mock_stdscr.addstr.call_args_list]
-        assert any("Controlling Display 1" in str(call) for call in calls)
+        assert "Mode: Controlling Display 1" in lines
 
-    def test_draw_interface_pending_indicator(self, controller, mock_stdscr):
+    def test_draw_interface_pending_indicator(self, controller):
         """Test that pending changes show indicator"""
-        controller.stdscr = mock_stdscr
         controller.displays = [1]
         controller.target_brightness = {1: 60}
         controller.max_brightness = {1: 100}
         controller.last_sent_brightness = {1: 50}  # Different from target
-        controller.worker = MagicMock()
-        controller.worker._last_sent = {}
+        controller.worker = SimpleNamespace(_last_sent={})
 
-        controller.draw_interface()
+        lines = controller._compute_paint(TERM_SIZE[1])
 
         # Should show pending indicator (*)
-        calls = [str(call) for call in mock_stdscr.addstr.call_args_list]
-        assert any("*" in str(call) for call in calls)
+        assert any(line.endswith(" *") for line in lines)
+
+    def test_compute_paint_leaves_state_alone(self, controller):
+        """Test that building a frame does not touch the last sent values"""
+        controller.displays = [1]
+        controller.target_brightness = {1: 60}
+        controller.max_brightness = {1: 100}
+        controller.last_sent_brightness = {1: 50}
+        controller.worker._last_sent[(1, "0x10")] = 60
+
+        controller._compute_paint(TERM_SIZE[1])
+
+        assert controller.last_sent_brightness == {1: 50}
 
-    def test_cleanup(self, controller, mocker):
+    def test_draw_interface_clears_sent_pending_marker(self, draw_controller, mock_stdscr):
+        """Test that a value the worker has sent is drawn without the pending marker"""
+        draw_controller.target_brightness[1] = 60
+        draw_controller.worker._last_sent[(1, "0x10")] = 60
+
+        draw_controller.draw_interface()
+
+        rows = [c.args[2] for c in mock_stdscr.addstr.call_args_list]
+        assert any("60%" in row and not row.endswith(" *") for row in rows)
+        assert draw_controller.last_sent_brightness[1] == 60
+
+    def test_cleanup(self, controller):
         """Test cleanup on exit"""
-        mock_stop = mocker.patch.object(controller, "stop_worker")
+        stopped = []
+        controller.stop_worker = lambda: stopped.append(True)
 
         controller.cleanup()
 
-        mock_stop.assert_called_once()
+        assert stopped == [True]
+
+    def test_draw_interface_skips_unchanged_rows(self, draw_controller, mock_stdscr, mock_doupdate):
+        """Test that only changed rows are rewritten on subsequent frames"""
+        draw_controller.draw_interface()
+        mock_stdscr.reset_mock()
+        mock_doupdate.reset_mock()
+        draw_controller.draw_interface()
+
+        # Nothing changed, so the frame is skipped entirely
+        mock_stdscr.erase.assert_not_called()
+        mock_stdscr.addstr.assert_not_called()
+        mock_stdscr.noutrefresh.assert_not_called()
+        mock_doupdate.assert_not_called()
+
+        draw_controller.target_brightness[1] = 60
+        draw_controller.draw_interface()
+
+        # Only the bar row for display 1 is rewritten
+        assert mock_stdscr.addstr.call_count == 1
+        assert "60%" in mock_stdscr.addstr.call_args.args[2]
+
+    def test_draw_interface_bar_width(self, controller, mock_stdscr):
+        """Test that the progress bar is sized from the cached bar strings"""
+        controller.stdscr = mock_stdscr
+        controller.displays = [1]
+        controller.target_brightness = {1: 50}
+        controller.max_brightness = {1: 100}
+        controller.last_sent_brightness = {1: 50}
+
+        controller.draw_interface()
+
+        rows = [c.args[2] for c in mock_stdscr.addstr.call_args_list]
+        assert "    [" + "#" * 25 + "-" * 25 + "]  50% (50/100)" in rows